@@ -1,12 +1,17 @@
+import fnmatch
+import json
 import os
+import re
 import sys
+import tarfile
 from io import StringIO
 
 import yaml
 from conan import ConanFile
 from conan.errors import ConanException, ConanInvalidConfiguration
+from conan.tools.build import check_min_cppstd
 from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout, CMakeConfigDeps
-from conan.tools.files import apply_conandata_patches, export_conandata_patches, get, copy
+from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy, collect_libs, load, save, patch, rmdir
 from conan.tools.scm import Version
 
 required_conan_version = ">=2.20"
@@ -172,8 +177,44 @@ CONFIGURE_OPTIONS = (
     "yap",
 )
 
+# Libraries installing mutually exclusive variants (stacktrace backends, Boost.Test runners). Each
+# packaged variant gets a Boost::<variant> component of its own and the library component only
+# requires the first of these defaults that was packaged, so consumers never link two of them.
+DEFAULT_VARIANTS = {
+    "stacktrace": ("stacktrace_windbg", "stacktrace_backtrace", "stacktrace_addr2line", "stacktrace_basic", "stacktrace_noop"),
+    "test": ("unit_test_framework",),
+}
+
+# Boost's CMake build never looks for liburing. With asio_io_uring, this file is included right after
+# project(Boost) so every compiled library, and Asio's headers in them, gets liburing.
+ASIO_IO_URING_PROJECT_INCLUDE = """\
+find_package(liburing REQUIRED CONFIG)
+link_libraries(liburing::liburing)
+"""
+
+# Included at the end of the installed BoostConfig.cmake, gives the Asio definitions the libraries were
+# built with and liburing to CMake consumers, which never see the components of package_info()
+ASIO_IO_URING_CONFIG = """\
+include(CMakeFindDependencyMacro)
+find_dependency(liburing CONFIG)
+foreach(_boost_target IN ITEMS Boost::headers Boost::asio)
+    if(TARGET ${_boost_target})
+        get_target_property(_boost_definitions ${_boost_target} INTERFACE_COMPILE_DEFINITIONS)
+        if(NOT _boost_definitions MATCHES "BOOST_ASIO_HAS_IO_URING")
+            set_property(TARGET ${_boost_target} APPEND PROPERTY INTERFACE_COMPILE_DEFINITIONS @DEFINITIONS@)
+            set_property(TARGET ${_boost_target} APPEND PROPERTY INTERFACE_LINK_LIBRARIES liburing::liburing)
+        endif()
+    endif()
+endforeach()
+"""
+
+# Dependency indexes already loaded by this process, keyed by file path
+_dependency_indexes = {}
+
 class BoostRecipe(ConanFile):
     name = "boost"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "library"
     implements = ["auto_shared_fpic"]
     settings = "os", "arch", "compiler", "build_type"
@@ -182,10 +223,16 @@ class BoostRecipe(ConanFile):
     options = {
         "shared": [True, False],
         "fPIC": [True, False],
+        "header_only": [None, True, False],
+        "unity_build": [True, False],
+        "unity_build_batch_size": ["ANY"],
+        "use_modules": [True, False],
         "runtime": [None, "static", "shared"],
         "python_version": [None, "ANY"],
         "python_executable": [None, "ANY"],
         "asio_no_deprecated": [True, False],
+        "asio_io_uring": [True, False],
+        "asio_disable_epoll": [True, False],
         "filesystem_no_deprecated": [True, False],
         "filesystem_use_std_fs": [True, False],
         "filesystem_version": [None, "3", "4"],
@@ -223,6 +270,10 @@ class BoostRecipe(ConanFile):
     default_options = {
         "shared": False,
         "fPIC": True,
+        "header_only": None,
+        "unity_build": False,
+        "unity_build_batch_size": "16",
+        "use_modules": False,
 
         "runtime": None,
 
@@ -230,6 +281,8 @@ class BoostRecipe(ConanFile):
         "python_executable": None,
 
         "asio_no_deprecated": True,
+        "asio_io_uring": False,
+        "asio_disable_epoll": False,
         "filesystem_no_deprecated": True,
         "filesystem_use_std_fs": False,
         "filesystem_version": None,
@@ -266,26 +319,113 @@ class BoostRecipe(ConanFile):
     default_options.update({f"with_{_name}": None for _name in CONFIGURE_OPTIONS})
     default_options.update({f"without_{_name}": None for _name in CONFIGURE_OPTIONS})
 
-    _cached_dependencies = None
-
     @property
     def _dependency_filename(self):
         return f"dependencies-{self.version}.yml"
 
+    @property
+    def _dependency_index_filename(self):
+        return f"dependencies-{self.version}.json"
+
+    @staticmethod
+    def _build_dependency_index(dependencies):
+        libraries = {libname: {"libs": (info or {}).get("libs", []), "requires": (info or {}).get("requires", [])}
+                     for libname, info in dependencies["libraries"].items()}
+        for info in libraries.values():
+            closure = set()
+            pending = list(info["requires"])
+            while pending:
+                libname = pending.pop()
+                if libname not in closure:
+                    closure.add(libname)
+                    pending.extend(libraries[libname]["requires"])
+            info["closure"] = closure
+        for libname, info in libraries.items():
+            info["closure"].add(libname)
+        return {"libraries": libraries}
+
     @property
     def _dependencies(self):
-        if self._cached_dependencies is None:
-            dependencies_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependency_filename)
-            if not os.path.isfile(dependencies_filepath):
-                raise ConanException(f"Cannot find {dependencies_filepath}")
-            with open(dependencies_filepath, encoding='utf-8') as f:
-                self._cached_dependencies = yaml.safe_load(f)
-        return self._cached_dependencies
+        dependencies_folder = os.path.join(self.recipe_folder, "dependencies")
+        index_filepath = os.path.join(dependencies_folder, self._dependency_index_filename)
+        index = _dependency_indexes.get(index_filepath)
+        if index is None:
+            if os.path.isfile(index_filepath):
+                with open(index_filepath, encoding="utf-8") as f:
+                    index = json.load(f)
+            else:
+                dependencies_filepath = os.path.join(dependencies_folder, self._dependency_filename)
+                if not os.path.isfile(dependencies_filepath):
+                    raise ConanException(f"Cannot find {dependencies_filepath}")
+                with open(dependencies_filepath, encoding="utf-8") as f:
+                    index = self._build_dependency_index(yaml.safe_load(f))
+            for info in index["libraries"].values():
+                info["closure"] = frozenset(info["closure"])
+            _dependency_indexes[index_filepath] = index
+        return index
 
     @property
     def _available_libraries(self):
         return self._dependencies["libraries"]
 
+    def _library_libs(self, libname):
+        return self._available_libraries[libname]["libs"]
+
+    def _library_requires(self, libname):
+        return self._available_libraries[libname]["requires"]
+
+    def _dependency_closure(self, libraries):
+        available_libraries = self._available_libraries
+        return set().union(*(available_libraries[libname]["closure"] for libname in libraries))
+
+    def _get_library_selection(self, options):
+        requested, without = [], set()
+        for libname in self._available_libraries:
+            if options.get_safe(f"with_{libname}"):
+                requested.append(libname)
+            if options.get_safe(f"without_{libname}"):
+                without.add(libname)
+        return requested, without
+
+    @property
+    def _library_selection(self):
+        return self._get_library_selection(self.options)
+
+    def _effective_exclusions(self, requested, without):
+        if requested:
+            return without
+        # Boost only builds these when explicitly enabled, they need an external Python/MPI
+        return without | ({"python", "mpi"} & self._available_libraries.keys())
+
+    def _resolve_libraries(self, requested, without):
+        if requested:
+            return self._dependency_closure(requested)
+        excluded = self._effective_exclusions(requested, without)
+        return {libname for libname, info in self._available_libraries.items() if info["closure"].isdisjoint(excluded)}
+
+    @property
+    def _selected_libraries(self):
+        return self._resolve_libraries(*self._library_selection)
+
+    @property
+    def _is_header_only_selection(self):
+        if self.options.use_modules:
+            return False
+        requested, without = self._library_selection
+        return bool(requested) and not any(map(self._library_libs, self._resolve_libraries(requested, without)))
+
+    @staticmethod
+    def _library_folder(libname):
+        if libname.startswith("numeric_"):
+            return os.path.join("libs", "numeric", libname[len("numeric_"):])
+        return os.path.join("libs", libname)
+
+    @staticmethod
+    def _cmake_library_name(libname):
+        if libname.startswith("numeric_"):
+            return libname.replace("_", "/", 1)
+        return libname
+
     @property
     def _python_executable(self):
         exe = self.options.python_executable if self.options.python_executable else sys.executable
@@ -310,46 +450,100 @@ class BoostRecipe(ConanFile):
 
     def export(self):
         copy(self, f"dependencies/{self._dependency_filename}", src=self.recipe_folder, dst=self.export_folder)
+        save(self, os.path.join(self.export_folder, "dependencies", self._dependency_index_filename),
+             json.dumps(self._dependencies, default=sorted))
 
     def export_sources(self):
         export_conandata_patches(self)
 
     def requirements(self):
-        if self.options.iostreams_zlib:
-            self.requires("zlib/[>=1.3.1]")
-        if self.options.iostreams_bzip2:
-            self.requires("bzip2/1.0.8")
-        if self.options.iostreams_lzma:
-            self.requires("xz_utils/[>=5.8.2]")
-        if self.options.iostreams_zstd:
-            self.requires("zstd/[>=1.5.7]")
-        if self.options.locale_icu:
-            self.requires("icu/[>=77.1]")
-        if self.options.locale_iconv:
-            self.requires("libiconv/[>=1.18]")
-        if self.options.stacktrace_backtrace:
+        selected_libraries = self._selected_libraries
+        if self._asio_io_uring:
+            self.requires("liburing/[>=2.4]", transitive_headers=True, transitive_libs=True)
+        if "iostreams" in selected_libraries:
+            if self.options.iostreams_zlib:
+                self.requires("zlib/[>=1.3.1]")
+            if self.options.iostreams_bzip2:
+                self.requires("bzip2/1.0.8")
+            if self.options.iostreams_lzma:
+                self.requires("xz_utils/[>=5.8.2]")
+            if self.options.iostreams_zstd:
+                self.requires("zstd/[>=1.5.7]")
+        if "locale" in selected_libraries:
+            if self.options.locale_icu:
+                self.requires("icu/[>=77.1]")
+            if self.options.locale_iconv:
+                self.requires("libiconv/[>=1.18]")
+        if "stacktrace" in selected_libraries and self.options.stacktrace_backtrace:
             self.requires("libbacktrace/cci.20240730", transitive_headers=True, transitive_libs=True)
 
+    @property
+    def _source_archive(self):
+        return os.path.join(self.source_folder, "boost.tar.gz")
+
+    @property
+    def _selective_extraction(self):
+        return os.path.isfile(self._source_archive)
+
+    @property
+    def _extracted_source_folder(self):
+        if self._selective_extraction:
+            return os.path.join(self.build_folder, "boost-src")
+        return self.source_folder
+
     def source(self):
-        get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
+        source_cache = self.python_requires["source_cache"].module
+        if self.conf.get("user.boost:selective_extraction", default=False, check_type=bool):
+            # Only download and verify here, build() extracts the libraries of the resolved set
+            source_cache.download(self, **self.conan_data["sources"][self.version], filename=self._source_archive)
+            return
+        source_cache.get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
         apply_conandata_patches(self)
 
+    def _extract_sources(self):
+        destination = self._extracted_source_folder
+        rmdir(self, destination)
+        library_folders = tuple(f"{self._library_folder(libname).replace(os.sep, '/')}/" for libname in self._selected_libraries)
+        extract_args = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        with tarfile.open(self._source_archive, "r|gz") as tar:
+            for member in tar:
+                name = member.name.split("/", 1)[1] if "/" in member.name else ""
+                if not name or (name.startswith("libs/") and not f"{name}/".startswith(library_folders)):
+                    continue
+                member.name = name
+                tar.extract(member, destination, **extract_args)
+
+        for entry in self.conan_data.get("patches", {}).get(self.version, []):
+            patch_file = os.path.join(self.export_sources_folder, entry["patch_file"])
+            with open(patch_file, encoding="utf-8") as f:
+                patched_files = re.findall(r"^--- a/(\S+)", f.read(), re.MULTILINE)
+            if all(os.path.isfile(os.path.join(destination, path)) for path in patched_files):
+                patch(self, patch_file=patch_file, base_path=destination)
+
     def layout(self):
         cmake_layout(self, src_folder="src")
 
     def config_options(self):
+        available_libraries = self._available_libraries.keys()
+        configure_options = set(CONFIGURE_OPTIONS)
+
         # Test whether all config_options from the yml are available in CONFIGURE_OPTIONS
-        for opt_name in self._available_libraries:
-            if (f"with_{opt_name}" not in self.options) or (f"without_{opt_name}" not in self.options):
-                raise ConanException(f"{self._dependency_filename} has the configure options {opt_name} which is not available in conanfile.py")
+        unknown_libraries = available_libraries - configure_options
+        if unknown_libraries:
+            raise ConanException(f"{self._dependency_filename} has the configure options {', '.join(sorted(unknown_libraries))} which is not available in conanfile.py")
 
         # Remove options not supported by this version of boost
-        for dep_name in CONFIGURE_OPTIONS:
-            if dep_name not in self._available_libraries:
-                delattr(self.options, f"with_{dep_name}")
+        for dep_name in configure_options - available_libraries:
+            delattr(self.options, f"with_{dep_name}")
 
     def configure(self):
-        if self.options.with_python:
+        if str(self.options.header_only) == "None":
+            self.options.header_only = self._is_header_only_selection
+        if self.options.header_only:
+            self.options.rm_safe("shared")
+            self.options.rm_safe("fPIC")
+
+        if "python" in self._selected_libraries:
             if not self.options.python_version:
                 self.options.python_version = self._detect_python_version()
             else:
@@ -357,15 +551,81 @@ class BoostRecipe(ConanFile):
                 if version != self.options.python_version:
                     raise ConanInvalidConfiguration(f"detected python version {version} doesn't match conan option {self.options.python_version}")
 
+    def validate(self):
+        if self.options.header_only and self.options.use_modules:
+            raise ConanInvalidConfiguration(
+                "boost:header_only=True conflicts with boost:use_modules=True, the module interfaces "
+                "are compiled libraries that a header-only package cannot contain")
+
+        if self.options.header_only and not self._is_header_only_selection:
+            compiled = sorted(libname for libname in self._selected_libraries if self._library_libs(libname))
+            raise ConanInvalidConfiguration(
+                f"boost:header_only=True requires a with_* selection of header-only libraries, "
+                f"but it needs {', '.join(compiled)}")
+
+        if self.options.use_modules:
+            check_min_cppstd(self, 20)
+
+        if self.options.asio_io_uring and self.settings.os != "Linux":
+            raise ConanInvalidConfiguration("boost:asio_io_uring is only available on Linux")
+
+        if self.options.unity_build and not str(self.options.unity_build_batch_size).isdigit():
+            raise ConanInvalidConfiguration(
+                f"boost:unity_build_batch_size must be a non-negative integer, got {self.options.unity_build_batch_size}")
+
+        requested, without = self._library_selection
+        excluded = self._effective_exclusions(requested, without)
+        for libname in requested:
+            conflicts = self._available_libraries[libname]["closure"] & excluded
+            if conflicts:
+                raise ConanInvalidConfiguration(
+                    f"boost:with_{libname} needs {', '.join(sorted(conflicts))}, "
+                    f"which {'is' if len(conflicts) == 1 else 'are'} disabled by without_* options")
+
     def package_id(self):
+        # Many with_*/without_* spellings describe the same build, keep only the resolved library set.
+        # Header-only libraries stay in it: Boost only installs the headers of BOOST_INCLUDE_LIBRARIES.
+        selected_libraries = self._resolve_libraries(*self._get_library_selection(self.info.options))
+        for libname in CONFIGURE_OPTIONS:
+            self.info.options.rm_safe(f"without_{libname}")
+            if libname in selected_libraries:
+                setattr(self.info.options, f"with_{libname}", True)
+            else:
+                self.info.options.rm_safe(f"with_{libname}")
+
+        if self.info.options.header_only:
+            self.info.settings.clear()
+            for opt_name in self.default_options:
+                if not opt_name.startswith(("with_", "header_only")):
+                    self.info.options.rm_safe(opt_name)
+            return
         del self.info.options.filesystem_version
         del self.info.options.system_use_utf8
+        if "asio" not in selected_libraries:
+            del self.info.options.asio_io_uring
+            del self.info.options.asio_disable_epoll
+        if not self.info.options.unity_build:
+            del self.info.options.unity_build_batch_size
+
+    @property
+    def _asio_io_uring(self):
+        return bool(self.options.asio_io_uring) and "asio" in self._selected_libraries
+
+    @property
+    def _asio_definitions(self):
+        defines = {}
+        if self.options.asio_io_uring:
+            defines["BOOST_ASIO_HAS_IO_URING"] = '1'
+        if self.options.asio_disable_epoll:
+            defines["BOOST_ASIO_DISABLE_EPOLL"] = '1'
+        return defines
 
     @property
     def _build_definitions(self):
         defines = {}
         if self.options.asio_no_deprecated:
             defines["BOOST_ASIO_NO_DEPRECATED"] = '1'
+        defines.update(self._asio_definitions)
         if self.options.filesystem_no_deprecated:
             defines["BOOST_FILESYSTEM_NO_DEPRECATED"] = '1'
         if self.options.system_use_utf8:
@@ -380,7 +640,6 @@ class BoostRecipe(ConanFile):
             "filesystem_use_std_fs": "BOOST_DLL_USE_STD_FS",
             "system_use_utf8": "BOOST_SYSTEM_USE_UTF8",
             "asio_no_deprecated": "BOOST_ASIO_NO_DEPRECATED",
-            "with_python": "BOOST_ENABLE_PYTHON",
 
             # Iostreams
             "iostreams_zlib": "BOOST_IOSTREAMS_ENABLE_ZLIB",
@@ -437,37 +696,32 @@ class BoostRecipe(ConanFile):
             flags["CMAKE_C_VISIBILITY_PRESET"] = visibility
             flags["CMAKE_VISIBILITY_INLINES_HIDDEN"] = "ON" if visibility == "default" else "OFF"
 
-        with_python = self.options.get_safe("with_python")
-        if with_python is False:
-            flags["Python_ROOT_DIR"] = os.path.dirname(self._python_executable)
-
-        include_libraries = ""
-        for libname in self._available_libraries:
-            if getattr(self.options, f"with_{libname}"):
-                if libname.startswith("numeric"):
-                    libname.replace("_", "/")
-                include_libraries += f"{libname};"
+        if self.options.get_safe("unity_build"):
+            flags["CMAKE_UNITY_BUILD"] = "ON"
+            flags["CMAKE_UNITY_BUILD_BATCH_SIZE"] = str(self.options.unity_build_batch_size)
 
-        if include_libraries:
-            if include_libraries[-1] == ";":
-                include_libraries = include_libraries[:-1]
-            flags["BOOST_INCLUDE_LIBRARIES"] = include_libraries
+        if self.options.get_safe("use_modules"):
+            flags["BOOST_USE_MODULES"] = "ON"
+            flags["CMAKE_CXX_SCAN_FOR_MODULES"] = "ON"
 
-        exclude_libraries = ""
-        for libname in self._available_libraries:
-            if getattr(self.options, f"without_{libname}"):
-                if libname.startswith("numeric"):
-                    libname.replace("_", "/")
-                exclude_libraries += f"{libname};"
+        requested, without = self._library_selection
+        selected_libraries = self._resolve_libraries(requested, without)
+        if "python" in selected_libraries:
+            flags["BOOST_ENABLE_PYTHON"] = "ON"
+            flags["Python_ROOT_DIR"] = os.path.dirname(self._python_executable)
+        if "mpi" in selected_libraries:
+            flags["BOOST_ENABLE_MPI"] = "ON"
 
-        if exclude_libraries:
-            if exclude_libraries[-1] == ";":
-                exclude_libraries = exclude_libraries[:-1]
-            flags["BOOST_EXCLUDE_LIBRARIES"] = exclude_libraries
+        if requested or without:
+            flags["BOOST_INCLUDE_LIBRARIES"] = ";".join(sorted(map(self._cmake_library_name, selected_libraries)))
+        if without:
+            flags["BOOST_EXCLUDE_LIBRARIES"] = ";".join(sorted(map(self._cmake_library_name, without)))
 
         return flags
 
     def generate(self):
+        if self.options.header_only:
+            return
         deps = CMakeConfigDeps(self)
         deps.generate()
         tc = CMakeToolchain(self)
@@ -475,21 +729,150 @@ class BoostRecipe(ConanFile):
             tc.preprocessor_definitions[key] = value
         for key, value in self._build_flags.items():
             tc.variables[key] = value
+        if self._asio_io_uring:
+            project_include = os.path.join(self.generators_folder, "boost_asio_io_uring.cmake")
+            save(self, project_include, ASIO_IO_URING_PROJECT_INCLUDE)
+            tc.variables["CMAKE_PROJECT_Boost_INCLUDE"] = project_include.replace("\\", "/")
         tc.generate()
 
     def build(self):
+        if self._selective_extraction:
+            self._extract_sources()
+        if self.options.header_only:
+            self.output.info("Header-only selection, skipping CMake build")
+            return
         cmake = CMake(self)
-        cmake.configure()
+        cmake.configure(build_script_folder=self._extracted_source_folder)
         cmake.build()
 
     def package(self):
-        cmake = CMake(self)
-        cmake.install()
-        copy(self, "LICENSE*", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
+        if self.options.header_only:
+            for libname in self._selected_libraries:
+                copy(self, "*", src=os.path.join(self._extracted_source_folder, self._library_folder(libname), "include"),
+                     dst=os.path.join(self.package_folder, "include"))
+        else:
+            cmake = CMake(self)
+            cmake.install()
+            if self._asio_io_uring:
+                self._package_asio_io_uring_config()
+        copy(self, "LICENSE*", src=self._extracted_source_folder, dst=os.path.join(self.package_folder, "licenses"))
+
+    @property
+    def _cmake_config_folder(self):
+        return os.path.join("lib", "cmake", f"Boost-{".".join(map(str, Version(self.version).main))}")
+
+    @staticmethod
+    def _asio_io_uring_config(definitions):
+        return ASIO_IO_URING_CONFIG.replace("@DEFINITIONS@", " ".join(f"{key}={value}" for key, value in definitions.items()))
+
+    def _package_asio_io_uring_config(self):
+        config_folder = os.path.join(self.package_folder, self._cmake_config_folder)
+        save(self, os.path.join(config_folder, "BoostAsioIoUring.cmake"), self._asio_io_uring_config(self._asio_definitions))
+        config = os.path.join(config_folder, "BoostConfig.cmake")
+        save(self, config, load(self, config) + '\ninclude("${CMAKE_CURRENT_LIST_DIR}/BoostAsioIoUring.cmake")\n')
+
+    @staticmethod
+    def _match_libs(patterns, libs):
+        matched = []
+        for pattern in patterns:
+            for lib in libs:
+                name = lib[3:] if lib.startswith("libboost_") else lib
+                if fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(name, f"{pattern}-*"):
+                    matched.append(lib)
+        return matched
+
+    @property
+    def _external_requires(self):
+        return {
+            "iostreams": [
+                *(["zlib::zlib"] if self.options.iostreams_zlib else []),
+                *(["bzip2::bzip2"] if self.options.iostreams_bzip2 else []),
+                *(["xz_utils::xz_utils"] if self.options.iostreams_lzma else []),
+                *(["zstd::zstdlib"] if self.options.iostreams_zstd else []),
+            ],
+            "locale": [
+                *(["icu::icu-uc", "icu::icu-i18n"] if self.options.locale_icu else []),
+                *(["libiconv::libiconv"] if self.options.locale_iconv else []),
+            ],
+            "stacktrace": ["libbacktrace::libbacktrace"] if self.options.stacktrace_backtrace else [],
+            "asio": ["liburing::liburing"] if self.options.asio_io_uring else [],
+        }
+
+    @property
+    def _system_libs(self):
+        if self.settings.os in ("Linux", "FreeBSD"):
+            return {
+                "asio": ["pthread"],
+                "fiber": ["pthread"],
+                "log": ["pthread", "rt"],
+                "stacktrace": ["dl"],
+                "thread": ["pthread", "rt"],
+            }
+        if self.settings.os == "Windows":
+            return {
+                "asio": ["ws2_32", "mswsock"],
+                "filesystem": ["advapi32"],
+                "log": ["ws2_32", "mswsock", "advapi32"],
+                "stacktrace": ["ole32", "dbgeng"],
+                "uuid": ["bcrypt"],
+            }
+        return {}
+
+    def _variant_components(self, libname, lib_patterns, packaged_libs, builddirs):
+        libinfo = self._available_libraries[libname]
+        external_requires = self._external_requires.get(libname, [])
+        variants = []
+        for pattern in lib_patterns:
+            libs = self._match_libs([pattern], packaged_libs)
+            if not libs:
+                continue
+            variant = pattern[len("boost_"):]
+            variants.append(variant)
+            component = self.cpp_info.components[variant]
+            component.set_property("cmake_target_name", f"Boost::{variant}")
+            component.builddirs = builddirs
+            component.libs = libs
+            component.requires = list(libinfo["requires"])
+            if variant == "stacktrace_backtrace":
+                component.requires += external_requires
+            component.system_libs = self._system_libs.get(libname, [])
+        default = next((variant for variant in DEFAULT_VARIANTS[libname] if variant in variants), None)
+        return [default] if default else list(libinfo["requires"])
 
     def package_info(self):
-        self.cpp_info.set_property("cmake_find_mode", "none")
         self.cpp_info.set_property("cmake_file_name", "Boost")
-        self.cpp_info.builddirs = [
-            os.path.join("lib", "cmake", f"Boost-{".".join(map(str, Version(self.version).main))}")
-        ]
+        if self.options.header_only:
+            # No BoostConfig.cmake is installed, let Conan generate it from the components
+            self.cpp_info.set_property("cmake_find_mode", "config")
+            builddirs = []
+        else:
+            self.cpp_info.set_property("cmake_find_mode", "none")
+            builddirs = [self._cmake_config_folder]
+        self.cpp_info.builddirs = builddirs
+
+        packaged_libs = collect_libs(self)
+        external_requires = self._external_requires
+        system_libs = self._system_libs
+        for libname in sorted(self._selected_libraries):
+            libinfo = self._available_libraries[libname]
+            component = self.cpp_info.components[libname]
+            component.set_property("cmake_target_name", f"Boost::{libname}")
+            component.builddirs = builddirs
+            lib_patterns = libinfo["libs"]
+            if not lib_patterns and self.options.use_modules:
+                # Libraries with module support install their module interface as boost_<lib>
+                lib_patterns = [f"boost_{libname}"]
+            if libname in DEFAULT_VARIANTS:
+                component.libdirs = []
+                component.bindirs = []
+                component.requires = self._variant_components(libname, lib_patterns, packaged_libs, builddirs)
+                continue
+            component.libs = self._match_libs(lib_patterns, packaged_libs)
+            if not component.libs:
+                component.libdirs = []
+                component.bindirs = []
+            component.requires = libinfo["requires"] + external_requires.get(libname, [])
+            component.system_libs = system_libs.get(libname, [])
+
+        if "asio" in self.cpp_info.components:
+            self.cpp_info.components["asio"].defines = [f"{key}={value}" for key, value in self._asio_definitions.items()]
@@ -1,7 +1,37 @@
 # Helper script to get dependencies yaml
 import glob
+import re
 
+ADD_LIBRARY_RE = re.compile(r"add_library\s*\(\s*(boost_[\w${}.]+)\s*([A-Z]*)")
+DEPENDENCY_RE = re.compile(r"Boost::(\w+)")
+
+libraries = {}
 for x in sorted(x for p in ("libs/numeric/*/CMakeLists.txt", "libs/*/CMakeLists.txt") for x in glob.iglob(p)):
-    x = x[5:-15]
-    x = x.replace("/", "_")
-    print("-", x)
+    name = x[5:-15].replace("/", "_")
+    with open(x, encoding="utf-8") as f:
+        libraries[name] = f.read()
+
+print("libraries:")
+for name, content in libraries.items():
+    libs = []
+    for target, kind in ADD_LIBRARY_RE.findall(content):
+        if kind in ("INTERFACE", "ALIAS", "IMPORTED"):
+            continue
+        target = re.sub(r"\$\{[^}]*\}", "[0-9]*", target)
+        if target not in libs:
+            libs.append(target)
+    # Only edges to other libraries form the dependency graph, Boost::<lib>_<component> style targets are skipped
+    requires = sorted(dep for dep in set(DEPENDENCY_RE.findall(content)) if dep != name and dep in libraries)
+
+    if not libs and not requires:
+        print(f"  {name}: {{}}")
+        continue
+    print(f"  {name}:")
+    if libs:
+        print("    libs:")
+        for lib in libs:
+            print(f"    - {lib}")
+    if requires:
+        print("    requires:")
+        for dep in requires:
+            print(f"    - {dep}")
@@ -2,12 +2,14 @@ import os
 
 from conan import ConanFile
 from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout, CMakeConfigDeps
-from conan.tools.files import apply_conandata_patches, export_conandata_patches, get, copy
+from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
 
 required_conan_version = ">=2.20"
 
 class fmtRecipe(ConanFile):
     name = "fmt"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "library"
     implements = ["auto_shared_fpic"]
     settings = "os", "arch", "compiler", "build_type"
@@ -27,7 +29,8 @@ class fmtRecipe(ConanFile):
         export_conandata_patches(self)
 
     def source(self):
-        get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
+        source_cache = self.python_requires["source_cache"].module
+        source_cache.get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
         apply_conandata_patches(self)
 
     def layout(self):
@@ -3,12 +3,13 @@ import os
 from conan import ConanFile
 from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout, CMakeConfigDeps
 from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
-from conan.tools.scm import Git
 
 required_conan_version = ">=2.20"
 
 class FrozenRecipe(ConanFile):
     name = "frozen"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "header-library"
     implements = ["auto_header_only"]
     settings = "os", "compiler", "build_type", "arch"
@@ -18,8 +19,9 @@ class FrozenRecipe(ConanFile):
 
     def source(self):
         src_data = self.conan_data["sources"][self.version]
-        git = Git(self)
-        git.fetch_commit(url="https://github.com/serge-sans-paille/frozen.git", commit=src_data["commit"])
+        source_cache = self.python_requires["source_cache"].module
+        source_cache.git_clone(self, url="https://github.com/serge-sans-paille/frozen.git", commit=src_data["commit"],
+                               target=self.source_folder)
         apply_conandata_patches(self)
 
     def layout(self):
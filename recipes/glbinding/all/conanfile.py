@@ -3,12 +3,13 @@ import os
 from conan import ConanFile
 from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout, CMakeConfigDeps
 from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
-from conan.tools.scm import Git
 
 required_conan_version = ">=2.20"
 
 class glbindingRecipe(ConanFile):
     name = "glbinding"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "library"
     implements = ["auto_shared_fpic"]
     settings = "os", "arch", "compiler", "build_type"
@@ -30,15 +31,9 @@ class glbindingRecipe(ConanFile):
 
     def source(self):
         src_data = self.conan_data["sources"][self.version]
-        git = Git(self)
-        git.clone(
-            url="https://github.com/cginternals/glbinding.git",
-            args=[
-                "--depth", "1",
-                "--branch", src_data["tag"]
-            ],
-            target=self.source_folder
-        )
+        source_cache = self.python_requires["source_cache"].module
+        source_cache.git_clone(self, url="https://github.com/cginternals/glbinding.git", tag=src_data["tag"],
+                               target=self.source_folder)
         apply_conandata_patches(self)
 
     def layout(self):
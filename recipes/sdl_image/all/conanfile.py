@@ -1,14 +1,26 @@
 import os
+import re
 
 from conan import ConanFile
 from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout, CMakeConfigDeps
-from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
-from conan.tools.scm import Git
+from conan.tools.files import export_conandata_patches, copy, patch
 
 required_conan_version = ">=2.20"
 
+# external/ submodules of the vendored image libraries, by the option that builds them
+VENDORED_SUBMODULES = {
+    "with_avif": ("external/aom", "external/dav1d", "external/libavif"),
+    "with_jpg": ("external/jpeg",),
+    "with_jxl": ("external/libjxl",),
+    "with_png": ("external/libpng", "external/zlib"),
+    "with_tif": ("external/libtiff", "external/zlib"),
+    "with_webp": ("external/libwebp",),
+}
+
 class SDLImageRecipe(ConanFile):
     name = "sdl_image"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "library"
     implements = ["auto_shared_fpic"]
     settings = "os", "arch", "compiler", "build_type"
@@ -71,17 +83,38 @@ class SDLImageRecipe(ConanFile):
 
     def source(self):
         src_data = self.conan_data["sources"][self.version]
-        git = Git(self)
-        git.clone(
-            url="https://github.com/libsdl-org/SDL_image.git",
-            args=[
-                "--depth", "1",
-                "--branch", src_data["tag"],
-                "--recursive", "--shallow-submodules"
-            ],
-            target=self.source_folder
-        )
-        apply_conandata_patches(self)
+        source_cache = self.python_requires["source_cache"].module
+        # The vendored libraries depend on the options, build() checks out the ones that are enabled
+        # and applies the patches, which target them
+        source_cache.git_clone(self, url="https://github.com/libsdl-org/SDL_image.git", tag=src_data["tag"],
+                               target=self.source_folder)
+
+    @property
+    def _vendored_submodules(self):
+        return set().union(*(paths for option, paths in VENDORED_SUBMODULES.items() if self.options.get_safe(option)))
+
+    @property
+    def _vendored_source_folder(self):
+        return os.path.join(self.build_folder, "sdl_image-src")
+
+    def _checkout_vendored_sources(self):
+        # The source folder is shared by every configuration, the tree with the libraries of this
+        # one is assembled in the build folder, which belongs to one package_id
+        source_cache = self.python_requires["source_cache"].module
+        destination = self._vendored_source_folder
+        submodules = self._vendored_submodules
+        source_cache.git_checkout_submodules(self, self.source_folder, submodules, destination=destination)
+        not_built = set().union(*VENDORED_SUBMODULES.values()) - submodules
+        for entry in self.conan_data.get("patches", {}).get(self.version, []):
+            patch_file = os.path.join(self.export_sources_folder, entry["patch_file"])
+            with open(patch_file, encoding="utf-8") as f:
+                patched_files = re.findall(r"^--- a/(\S+)", f.read(), re.MULTILINE)
+            # Patches of libraries this configuration does not build have nothing to apply to,
+            # any other patch must apply
+            if patched_files and all(path.startswith(tuple(f"{sub}/" for sub in not_built)) for path in patched_files):
+                self.output.info(f"Skipping {entry['patch_file']}, its vendored library is not built")
+                continue
+            patch(self, patch_file=patch_file, base_path=destination)
 
     def requirements(self):
         self.requires(f"sdl/[>={self.version}]")
@@ -117,8 +150,9 @@ class SDLImageRecipe(ConanFile):
         tc.generate()
 
     def build(self):
+        self._checkout_vendored_sources()
         cmake = CMake(self)
-        cmake.configure()
+        cmake.configure(build_script_folder=self._vendored_source_folder)
         cmake.build()
 
     def package(self):
@@ -3,12 +3,26 @@ import os
 from conan import ConanFile
 from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout, CMakeConfigDeps
 from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
-from conan.tools.scm import Git
 
 required_conan_version = ">=2.20"
 
+# external/ submodules of the vendored codecs, by the option value that builds them
+VENDORED_SUBMODULES = {
+    ("with_flac", "libflac"): ("external/flac", "external/ogg"),
+    ("with_mod", "xmp"): ("external/libxmp",),
+    ("with_mod", "xmp-lite"): ("external/libxmp",),
+    ("with_mp3", "mpg123"): ("external/mpg123",),
+    ("with_opus", "True"): ("external/ogg", "external/opus", "external/opusfile"),
+    ("with_vorbis", "vorbisfile"): ("external/ogg", "external/vorbis"),
+    ("with_vorbis", "tremor"): ("external/ogg", "external/tremor"),
+    ("with_gme", "True"): ("external/libgme",),
+    ("with_wavpack", "True"): ("external/wavpack",),
+}
+
 class SDLMixerRecipe(ConanFile):
     name = "sdl_mixer"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "library"
     implements = ["auto_shared_fpic"]
     settings = "os", "arch", "compiler", "build_type"
@@ -56,27 +70,29 @@ class SDLMixerRecipe(ConanFile):
 
     def source(self):
         src_data = self.conan_data["sources"][self.version]
-        git = Git(self)
-        git.clone(
-            url="https://github.com/libsdl-org/SDL_mixer.git",
-            args=[
-                "--depth", "1",
-                "--branch", src_data["tag"],
-                "--recursive", "--shallow-submodules"
-            ],
-            target=self.source_folder
-        )
-        git.folder = os.path.join(self.source_folder, "external", "flac")
-        git.run("fetch --depth 1 origin 1.5.0")
-        git.checkout("FETCH_HEAD")
-        git.folder = os.path.join(self.source_folder, "external", "libgme")
-        git.run("fetch --depth 1 origin 0.6.5")
-        git.checkout("FETCH_HEAD")
-        git.folder = os.path.join(self.source_folder, "external", "opus")
-        git.run("fetch --depth 1 origin v1.6.1")
-        git.checkout("FETCH_HEAD")
+        source_cache = self.python_requires["source_cache"].module
+        # The vendored codecs depend on the options, build() checks out the ones that are enabled
+        source_cache.git_clone(self, url="https://github.com/libsdl-org/SDL_mixer.git", tag=src_data["tag"],
+                               target=self.source_folder)
         apply_conandata_patches(self)
 
+    @property
+    def _vendored_submodules(self):
+        return set().union(*(paths for (option, value), paths in VENDORED_SUBMODULES.items()
+                             if str(self.options.get_safe(option)) == value))
+
+    @property
+    def _vendored_source_folder(self):
+        return os.path.join(self.build_folder, "sdl_mixer-src")
+
+    def _checkout_vendored_sources(self):
+        # The source folder is shared by every configuration, the tree with the codecs of this one
+        # is assembled in the build folder, which belongs to one package_id
+        source_cache = self.python_requires["source_cache"].module
+        source_cache.git_checkout_submodules(self, self.source_folder, self._vendored_submodules,
+                                             tags=self.conan_data["sources"][self.version].get("submodules"),
+                                             destination=self._vendored_source_folder)
+
     def layout(self):
         cmake_layout(self, src_folder="src")
 
@@ -114,8 +130,9 @@ class SDLMixerRecipe(ConanFile):
         tc.generate()
 
     def build(self):
+        self._checkout_vendored_sources()
         cmake = CMake(self)
-        cmake.configure()
+        cmake.configure(build_script_folder=self._vendored_source_folder)
         cmake.build()
 
     def package(self):
@@ -3,12 +3,13 @@ import os
 from conan import ConanFile
 from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout, CMakeConfigDeps
 from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
-from conan.tools.scm import Git
 
 required_conan_version = ">=2.20"
 
 class SDLttfRecipe(ConanFile):
     name = "sdl_ttf"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "library"
     implements = ["auto_shared_fpic"]
     settings = "os", "arch", "compiler", "build_type"
@@ -32,16 +33,9 @@ class SDLttfRecipe(ConanFile):
 
     def source(self):
         src_data = self.conan_data["sources"][self.version]
-        git = Git(self)
-        git.clone(
-            url="https://github.com/libsdl-org/SDL_ttf.git",
-            args=[
-                "--depth", "1",
-                "--branch", src_data["tag"],
-                "--recursive", "--shallow-submodules"
-            ],
-            target=self.source_folder
-        )
+        source_cache = self.python_requires["source_cache"].module
+        source_cache.git_clone(self, url="https://github.com/libsdl-org/SDL_ttf.git", tag=src_data["tag"],
+                               target=self.source_folder, submodules=True)
         apply_conandata_patches(self)
 
     def layout(self):
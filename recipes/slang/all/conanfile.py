@@ -1,15 +1,27 @@
 import os
 
 from conan import ConanFile
+from conan.errors import ConanException
 from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout, CMakeConfigDeps
-from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
-from conan.tools.scm import Git
+from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy, collect_libs
 from conan.tools.build import cross_building
 
 required_conan_version = ">=2.20"
 
+# external/ submodules only some options build. Options are not available in source(), so it
+# checks these out for every configuration.
+OPTION_SUBMODULES = {
+    "with_gfx": ("external/glm", "external/stb", "external/metal-cpp"),
+    "with_slang_glslang": ("external/glslang", "external/spirv-tools"),
+}
+# Only used by slang-rhi, the tests and the examples, which generate() always disables. They are
+# not checked out with user.slang:selective_submodules.
+UNUSED_SUBMODULES = ("external/slang-rhi", "external/optix-dev", "external/imgui", "external/tinyobjloader")
+
 class SlangRecipe(ConanFile):
     name = "slang"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "library"
     implements = ["auto_shared_fpic"]
     settings = "os", "arch", "compiler", "build_type"
@@ -25,6 +37,9 @@ class SlangRecipe(ConanFile):
         "with_slangrt": [True, False],
         "with_slang_glslang": [True, False],
         "with_replayer": [True, False],
+        "embed_core_module": [True, False],
+        "embed_core_module_source": [True, False],
+        "generators_only": [True, False],
     }
 
     default_options = {
@@ -37,6 +52,9 @@ class SlangRecipe(ConanFile):
         "with_slangrt": False,
         "with_slang_glslang": True,
         "with_replayer": False,
+        "embed_core_module": True,
+        "embed_core_module_source": True,
+        "generators_only": False,
     }
 
     def export_sources(self):
@@ -44,7 +62,8 @@ class SlangRecipe(ConanFile):
 
     def build_requirements(self):
         if cross_building(self):
-            self.tool_requires(f"{self.name}/{self.version}")
+            # Only the generators run on the build machine, not the whole compiler
+            self.tool_requires(f"{self.name}/{self.version}", options={"generators_only": True})
 
     def requirements(self):
         self.requires("vulkan-headers/[>=1.4.350]")
@@ -53,18 +72,32 @@ class SlangRecipe(ConanFile):
         if self.options.slang_lib_type is None or str(self.options.slang_lib_type) == "None":
             self.options.slang_lib_type = "shared" if bool(self.options.shared) else "static"
 
+    def configure(self):
+        if self.options.generators_only:
+            # Only the code generators used by cross builds are built, none of the library options apply
+            self.package_type = "application"
+            for option in ("shared", "fPIC", "slang_lib_type", "with_dxil", "with_gfx", "with_slangc",
+                           "with_slangrt", "with_slang_glslang", "with_replayer", "embed_core_module",
+                           "embed_core_module_source"):
+                self.options.rm_safe(option)
+        elif self.options.shared:
+            self.options.rm_safe("fPIC")
+
     def source(self):
         src_data = self.conan_data["sources"][self.version]
-        git = Git(self)
-        git.clone(
-            url="https://github.com/shader-slang/slang.git",
-            args=[
-                "--depth", "1",
-                "--branch", src_data["tag"],
-                "--recursive", "--shallow-submodules"
-            ],
-            target=self.source_folder
-        )
+        source_cache = self.python_requires["source_cache"].module
+        selective = self.conf.get("user.slang:selective_submodules", default=False, check_type=bool)
+        source_cache.git_clone(self, url="https://github.com/shader-slang/slang.git", tag=src_data["tag"],
+                               target=self.source_folder, submodules=not selective)
+        submodules = source_cache.git_submodules(self, self.source_folder)
+        # Upstream renaming or dropping a submodule must not go unnoticed, or the selective
+        # checkout would silently skip or fetch the wrong trees
+        stale = set(UNUSED_SUBMODULES).union(*OPTION_SUBMODULES.values()) - submodules.keys()
+        if stale:
+            raise ConanException(f"slang {self.version} has no submodule {', '.join(sorted(stale))}, "
+                                 f"update OPTION_SUBMODULES and UNUSED_SUBMODULES")
+        if selective:
+            source_cache.git_checkout_submodules(self, self.source_folder, submodules.keys() - set(UNUSED_SUBMODULES))
         apply_conandata_patches(self)
 
     def layout(self):
@@ -77,18 +110,21 @@ class SlangRecipe(ConanFile):
         if cross_building(self):
             generators_bin_dir = self.dependencies.build["slang"].cpp_info.bindirs[0]
             tc.cache_variables["SLANG_GENERATORS_PATH"] = generators_bin_dir.replace("\\", "/")
-        tc.cache_variables["SLANG_ENABLE_DXIL"] = bool(self.options.with_dxil)
-        tc.cache_variables["SLANG_ENABLE_GFX"] = bool(self.options.with_gfx)
+        tc.cache_variables["SLANG_ENABLE_DXIL"] = bool(self.options.get_safe("with_dxil"))
+        tc.cache_variables["SLANG_ENABLE_GFX"] = bool(self.options.get_safe("with_gfx"))
         tc.cache_variables["SLANG_ENABLE_SLANGD"] = False
-        tc.cache_variables["SLANG_ENABLE_SLANGC"] = bool(self.options.with_slangc)
-        tc.cache_variables["SLANG_ENABLE_SLANGI"] = True
-        tc.cache_variables["SLANG_ENABLE_SLANGRT"] = bool(self.options.with_slangrt)
-        tc.cache_variables["SLANG_ENABLE_SLANG_GLSLANG"] = bool(self.options.with_slang_glslang)
+        tc.cache_variables["SLANG_ENABLE_SLANGC"] = bool(self.options.get_safe("with_slangc"))
+        tc.cache_variables["SLANG_ENABLE_SLANGI"] = not self.options.generators_only
+        tc.cache_variables["SLANG_ENABLE_SLANGRT"] = bool(self.options.get_safe("with_slangrt"))
+        tc.cache_variables["SLANG_ENABLE_SLANG_GLSLANG"] = bool(self.options.get_safe("with_slang_glslang"))
         tc.cache_variables["SLANG_ENABLE_TESTS"] = False
         tc.cache_variables["SLANG_ENABLE_EXAMPLES"] = False
-        tc.cache_variables["SLANG_ENABLE_REPLAYER"] = bool(self.options.with_replayer)
+        tc.cache_variables["SLANG_ENABLE_REPLAYER"] = bool(self.options.get_safe("with_replayer"))
         tc.cache_variables["SLANG_STANDARD_MODULE_DEVELOP_BUILD"] = False
-        tc.cache_variables["SLANG_LIB_TYPE"] = "STATIC" if str(self.options.slang_lib_type) == "static" else "SHARED"
+        # The precompiled core module spares every new global session from compiling it at startup
+        tc.cache_variables["SLANG_EMBED_CORE_MODULE"] = bool(self.options.get_safe("embed_core_module"))
+        tc.cache_variables["SLANG_EMBED_CORE_MODULE_SOURCE"] = bool(self.options.get_safe("embed_core_module_source"))
+        tc.cache_variables["SLANG_LIB_TYPE"] = "SHARED" if str(self.options.get_safe("slang_lib_type")) == "shared" else "STATIC"
         tc.cache_variables["SLANG_ENABLE_RELEASE_DEBUG_INFO"] = False
         tc.cache_variables["SLANG_ENABLE_SPLIT_DEBUG_INFO"] = False
         tc.cache_variables["SLANG_SLANG_LLVM_FLAVOR"] = "DISABLE"
@@ -99,6 +135,9 @@ class SlangRecipe(ConanFile):
     def build(self):
         cmake = CMake(self)
         cmake.configure()
+        if self.options.generators_only:
+            cmake.build(target="all-generators")
+            return
         if not cross_building(self):
             self.output.info("Building slang generators...")
             cmake.build(target="all-generators")
@@ -106,16 +145,52 @@ class SlangRecipe(ConanFile):
 
     def package(self):
         cmake = CMake(self)
-        if not cross_building(self):
+        if self.options.generators_only or not cross_building(self):
             self.output.info("Installing slang generators component...")
             cmake.install(component="generators")
-        cmake.install()
+        if not self.options.generators_only:
+            cmake.install()
         copy(self, "LICENSE*", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
 
     def package_info(self):
+        if self.options.generators_only:
+            self.cpp_info.includedirs = []
+            self.cpp_info.libdirs = []
+            return
         self.cpp_info.set_property("cmake_find_mode", "none")
         self.cpp_info.set_property("cmake_file_name", "slang")
         if self.settings.os == "Windows":
-            self.cpp_info.builddirs = ["cmake"]
+            builddirs = ["cmake"]
         else:
-            self.cpp_info.builddirs = [os.path.join("lib", "cmake", "slang")]
+            builddirs = [os.path.join("lib", "cmake", "slang")]
+
+        libs = collect_libs(self)
+        core = self.cpp_info.components["slang"]
+        core.set_property("cmake_target_name", "slang::slang")
+        core.libs = [lib for lib in libs if lib not in ("slang-rt", "gfx") and not lib.startswith("slang-glslang")]
+        core.requires = ["vulkan-headers::vulkan-headers"]
+        core.builddirs = builddirs
+        if self.options.slang_lib_type == "static" and self.settings.os in ["Linux", "FreeBSD"]:
+            core.system_libs = ["dl", "m", "pthread"]
+
+        if self.options.with_slang_glslang:
+            # slang loads this module on demand for GLSL and SPIR-V tooling, it is never linked
+            glslang = self.cpp_info.components["slang-glslang"]
+            glslang.set_property("cmake_target_name", "slang::slang-glslang")
+            glslang.includedirs = []
+            glslang.requires = ["slang"]
+        if self.options.with_slangrt:
+            runtime = self.cpp_info.components["slang-rt"]
+            runtime.set_property("cmake_target_name", "slang::slang-rt")
+            runtime.libs = ["slang-rt"]
+        if self.options.with_gfx:
+            gfx = self.cpp_info.components["gfx"]
+            gfx.set_property("cmake_target_name", "slang::gfx")
+            gfx.libs = ["gfx"]
+            gfx.requires = ["slang"]
+        if self.options.with_slangc:
+            slangc = self.cpp_info.components["slangc"]
+            slangc.set_property("cmake_target_name", "slang::slangc")
+            slangc.includedirs = []
+            slangc.libdirs = []
+            slangc.requires = ["slang"]
@@ -0,0 +1,148 @@
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from io import StringIO
+
+from conan import ConanFile
+from conan.errors import ConanException
+from conan.tools.build import build_jobs
+from conan.tools.files import copy
+
+required_conan_version = ">=2.20"
+
+# Folder shared by every build for compiled shaders, e.g. `user.slang_shaders:cache_folder=~/.cache/slang`.
+# Without it the cache lives in the build folder and only helps rebuilds of the same package.
+CACHE_FOLDER_CONF = "user.slang_shaders:cache_folder"
+OUTPUT_EXTENSIONS = {"spirv": ".spv", "module": ".slang-module"}
+
+_compiler_versions = {}
+
+
+def slangc_path(conanfile):
+    """slangc of the ``slang`` tool requirement, which must be built with ``with_slangc``"""
+    slang = conanfile.dependencies.build.get("slang")
+    if slang is None or "slangc" not in slang.cpp_info.components:
+        raise ConanException(f"{conanfile.ref}: shader precompilation needs tool_requires('slang/<version>') "
+                             "built with with_slangc=True")
+    executable = "slangc.exe" if conanfile.settings_build.os == "Windows" else "slangc"
+    return os.path.join(slang.cpp_info.components["slangc"].bindirs[0], executable)
+
+
+def _compiler_version(conanfile, slangc):
+    if slangc not in _compiler_versions:
+        output = StringIO()
+        conanfile.run(f'"{slangc}" -version', stdout=output, stderr=output, quiet=True)
+        _compiler_versions[slangc] = output.getvalue().strip()
+    return _compiler_versions[slangc]
+
+
+def _hash_file(digest, name, path):
+    # Keyed by the relative name so the cache is shared between build folders
+    digest.update(name.replace("\\", "/").encode())
+    with open(path, "rb") as f:
+        digest.update(f.read())
+
+
+def _read_depfile(path):
+    """Prerequisites of the Makefile style rules slangc -depfile writes"""
+    with open(path, encoding="utf-8") as f:
+        content = f.read().replace("\\\n", " ")
+    dependencies = []
+    for line in content.splitlines():
+        _, separator, prerequisites = line.partition(": ")
+        if separator:
+            dependencies += [dep.replace("\\ ", " ") for dep in re.split(r"(?<!\\)\s+", prerequisites.strip()) if dep]
+    return dependencies
+
+
+def _dependency_key(conanfile, common_key, dependencies):
+    # None when a dependency is gone, the shader then has to be compiled again to find its new ones
+    digest = hashlib.sha256(common_key.encode())
+    for name in dependencies:
+        path = os.path.join(conanfile.source_folder, name)
+        if not os.path.isfile(path):
+            return None
+        _hash_file(digest, name, path)
+    return digest.hexdigest()
+
+
+def compile_shaders(conanfile, shaders, output_folder, target="spirv", include_dirs=(), defines=None, args=()):
+    """Compile ``shaders`` (paths relative to the source folder) with slangc, in parallel
+
+    ``target`` is ``"spirv"`` for ``.spv`` files or ``"module"`` for ``.slang-module`` IR, written to
+    ``output_folder`` under the path of their source. Results are cached by the content of every file
+    the shader imports or includes, as listed by slangc's depfile, the compile arguments and the
+    slangc version, so unchanged shaders are copied from the cache instead of being compiled again.
+    Returns the output paths.
+    """
+    if target not in OUTPUT_EXTENSIONS:
+        raise ConanException(f"compile_shaders() target must be one of {', '.join(OUTPUT_EXTENSIONS)}")
+    extension = OUTPUT_EXTENSIONS[target]
+    slangc = slangc_path(conanfile)
+    command_args = [f"-D{name}" if value is None else f"-D{name}={value}" for name, value in (defines or {}).items()]
+    command_args += list(args)
+    if target == "spirv":
+        command_args += ["-target", "spirv"]
+    common_key = "\n".join([_compiler_version(conanfile, slangc), target, *include_dirs, *command_args])
+    command_args += [f'-I "{os.path.join(conanfile.source_folder, include_dir)}"' for include_dir in include_dirs]
+    cache_folder = conanfile.conf.get(CACHE_FOLDER_CONF, check_type=str)
+    cache_folder = os.path.expanduser(cache_folder) if cache_folder else os.path.join(conanfile.build_folder, "shader-cache")
+
+    def cache_path(key, suffix):
+        return os.path.join(cache_folder, key[:2], key + suffix)
+
+    def dependency_name(path):
+        path = os.path.abspath(os.path.join(conanfile.source_folder, path))
+        relative = os.path.relpath(path, conanfile.source_folder)
+        return path if relative.startswith(os.pardir) else relative
+
+    def compile_shader(shader):
+        source = os.path.join(conanfile.source_folder, shader)
+        output = os.path.join(output_folder, os.path.splitext(shader)[0] + extension)
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        # Two steps: the shader itself names the dependencies slangc found when it was last compiled,
+        # their content names the output
+        digest = hashlib.sha256(common_key.encode())
+        _hash_file(digest, shader, source)
+        manifest = cache_path(digest.hexdigest(), ".deps.json")
+        key = None
+        if os.path.isfile(manifest):
+            with open(manifest, encoding="utf-8") as f:
+                key = _dependency_key(conanfile, common_key, json.load(f))
+        if key is None or not os.path.isfile(cache_path(key, extension)):
+            staging = os.path.join(os.path.dirname(manifest), f"{os.getpid()}.{threading.get_ident()}")
+            os.makedirs(os.path.dirname(staging), exist_ok=True)
+            # slangc picks the output format from the extension, so it stays last
+            conanfile.run(f'"{slangc}" "{source}" {" ".join(command_args)} -depfile "{staging}.d" -o "{staging}{extension}"')
+            dependencies = [shader.replace("\\", "/")]
+            for path in _read_depfile(f"{staging}.d"):
+                name = dependency_name(path).replace("\\", "/")
+                if name not in dependencies:
+                    dependencies.append(name)
+            os.remove(f"{staging}.d")
+            key = _dependency_key(conanfile, common_key, dependencies)
+            os.makedirs(os.path.dirname(cache_path(key, extension)), exist_ok=True)
+            os.replace(f"{staging}{extension}", cache_path(key, extension))
+            with open(f"{staging}.json", "w", encoding="utf-8") as f:
+                json.dump(dependencies, f)
+            os.replace(f"{staging}.json", manifest)
+        shutil.copy2(cache_path(key, extension), output)
+        return output
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(build_jobs(conanfile) or 1, len(shaders)))) as executor:
+        return list(executor.map(compile_shader, shaders))
+
+
+def package_shaders(conanfile, output_folder, destination=os.path.join("res", "shaders")):
+    """Copy the shaders compiled into ``output_folder`` to ``destination`` in the package"""
+    for extension in OUTPUT_EXTENSIONS.values():
+        copy(conanfile, f"*{extension}", src=output_folder, dst=os.path.join(conanfile.package_folder, destination))
+
+
+class slang_shadersRecipe(ConanFile):
+    name = "slang_shaders"
+    package_type = "python-require"
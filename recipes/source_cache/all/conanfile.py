@@ -0,0 +1,315 @@
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import os
+import shutil
+import threading
+
+from conan import ConanFile
+from conan.errors import ConanException
+from conan.tools import files
+from conan.tools.scm import Git
+
+required_conan_version = ">=2.20"
+
+# Shared source acquisition for the recipes of this repository, which all python_requires it. It
+# has to be exported before any of them can be loaded:
+#
+#   conan export recipes/source_cache/all --version 1.0
+#
+# The recipes set package_id_python_mode = "unrelated_mode": this module only decides where
+# sources come from, so neither adding it nor changing it alters their package ids.
+
+# Root of the local source cache, e.g. `user.source_cache:folder=~/.conan2/source_cache`.
+# Without it every recipe downloads and clones straight from upstream as before.
+CACHE_FOLDER_CONF = "user.source_cache:folder"
+# Number of repositories fetched at the same time by git_clone_all() and for submodules
+JOBS_CONF = "user.source_cache:jobs"
+
+_mirror_locks = collections.defaultdict(threading.Lock)
+
+
+def _cache_folder(conanfile, kind):
+    folder = conanfile.conf.get(CACHE_FOLDER_CONF, check_type=str)
+    if not folder:
+        return None
+    folder = os.path.join(os.path.abspath(os.path.expanduser(folder)), kind)
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def resolve_url(base, url):
+    # Submodule URLs like ../foo.git are relative to the URL of the superproject
+    if not url.startswith(("./", "../")):
+        return url
+    base = base.rstrip("/")
+    for part in url.split("/"):
+        if part == "..":
+            base = base.rsplit("/", 1)[0]
+        elif part and part != ".":
+            base = f"{base}/{part}"
+    return base
+
+
+def _has_object(git, ref):
+    try:
+        git.run(f"rev-parse --verify --quiet {ref}^{{commit}}")
+        return True
+    except ConanException:
+        return False
+
+
+def mirror_path(cache, url):
+    """Bare mirror of ``url`` inside the ``git`` folder of the cache"""
+    name = url.rstrip("/").rsplit("/", 1)[-1]
+    name = name if name.endswith(".git") else f"{name}.git"
+    return os.path.join(cache, f"{hashlib.sha256(url.encode()).hexdigest()[:16]}-{name}")
+
+
+def mirror_refspec(tag=None, commit=None):
+    """Ref naming ``tag`` or ``commit`` in a mirror and the refspec fetching it there"""
+    if tag is not None:
+        return f"refs/tags/{tag}", f"+refs/tags/{tag}:refs/tags/{tag}"
+    return commit, f"+{commit}:refs/source_cache/{commit}"
+
+
+def archive_path(archives, sha256, filename):
+    """Archive with the given ``sha256`` inside the ``archives`` folder of the cache"""
+    return os.path.join(archives, sha256.lower(), filename)
+
+
+def _mirror(conanfile, cache, url, tag=None, commit=None):
+    """Bare mirror of ``url`` holding at least ``tag`` or ``commit``, fetched only once"""
+    mirror = mirror_path(cache, url)
+    with _mirror_locks[mirror]:
+        return mirror, _update_mirror(conanfile, cache, mirror, url, tag, commit)
+
+
+def _update_mirror(conanfile, cache, mirror, url, tag, commit):
+    if not os.path.isdir(mirror):
+        # Create it aside and move it in place so concurrent builds never see a half-made mirror
+        staging = f"{mirror}.{os.getpid()}"
+        Git(conanfile, folder=cache).run(f'init --bare "{staging}"')
+        Git(conanfile, folder=staging).run(f'remote add origin "{url}"')
+        try:
+            os.rename(staging, mirror)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+    git = Git(conanfile, folder=mirror)
+    ref, refspec = mirror_refspec(tag, commit)
+    if not _has_object(git, ref):
+        git.run(f"fetch --depth 1 origin {refspec}")
+    return git.run(f"rev-parse {ref}^{{commit}}")
+
+
+def _checkout_from_mirror(conanfile, cache, url, target, tag, commit, submodules):
+    mirror, revision = _mirror(conanfile, cache, url, tag=tag, commit=commit)
+    os.makedirs(target, exist_ok=True)
+    git = Git(conanfile, folder=target)
+    git.run("init -q")
+    # Same as `git clone --reference`: objects are borrowed from the mirror, nothing is copied
+    with open(os.path.join(target, ".git", "objects", "info", "alternates"), "w", encoding="utf-8") as f:
+        f.write(os.path.join(mirror, "objects").replace("\\", "/") + "\n")
+    git.run(f'remote add origin "{url}"')
+    # The mirror is shallow, its boundary keeps history walks like `git describe` from looking for
+    # the missing parents
+    if os.path.isfile(os.path.join(mirror, "shallow")):
+        shutil.copyfile(os.path.join(mirror, "shallow"), os.path.join(target, ".git", "shallow"))
+    if tag is not None:
+        # Same ref as the mirror, annotated tags included, for version detection from the tag
+        git.run(f"update-ref refs/tags/{tag} {Git(conanfile, folder=mirror).run(f'rev-parse refs/tags/{tag}')}")
+    git.run(f"checkout -q {revision}")
+    if submodules:
+        _update_submodules(conanfile, cache, url, target, submodules)
+
+
+def _update_submodules(conanfile, cache, url, folder, submodules):
+    # Only the top level is filtered, nested submodules are always needed by their parent
+    _run_concurrently(conanfile, [
+        functools.partial(_checkout_from_mirror, conanfile, cache, sub_url, os.path.join(folder, path), None, commit, True)
+        for path, (sub_url, commit) in git_submodules(conanfile, folder, url).items()
+        if submodules is True or path in submodules
+    ])
+
+
+def _run_concurrently(conanfile, calls):
+    if len(calls) <= 1:
+        for call in calls:
+            call()
+        return
+    jobs = conanfile.conf.get(JOBS_CONF, default=8, check_type=int)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(jobs, len(calls))) as executor:
+        futures = [executor.submit(call) for call in calls]
+    for future in futures:
+        future.result()
+
+
+def git_submodules(conanfile, folder, url=None):
+    """Submodules pinned by the checkout in ``folder``, as ``{path: (url, commit)}``
+
+    Relative submodule URLs are resolved against ``url``, by default the origin of the checkout.
+    """
+    if not os.path.isfile(os.path.join(folder, ".gitmodules")):
+        return {}
+    git = Git(conanfile, folder=folder)
+    url = url or git.run("remote get-url origin")
+    submodules = {}
+    for line in git.run(r"config -f .gitmodules --get-regexp ^submodule\..*\.path$").splitlines():
+        key, path = line.split(maxsplit=1)
+        name = key[len("submodule."):-len(".path")]
+        sub_url = resolve_url(url, git.run(f'config -f .gitmodules --get "submodule.{name}.url"'))
+        submodules[path] = (sub_url, git.run(f'rev-parse "HEAD:{path}"'))
+    return submodules
+
+
+def git_clone(conanfile, url, target, tag=None, commit=None, submodules=False):
+    """Check out ``tag`` or ``commit`` of ``url`` into ``target``
+
+    ``submodules`` is True for every submodule (recursively) or a list of the top level submodule
+    paths to initialize. With ``user.source_cache:folder`` set, the repository and its submodules
+    are fetched once into bare mirrors shared by every recipe and build, later checkouts of the
+    same tag or commit only touch the local disk.
+    """
+    if (tag is None) == (commit is None):
+        raise ConanException("git_clone() needs exactly one of tag or commit")
+    cache = _cache_folder(conanfile, "git")
+    if cache is not None:
+        _checkout_from_mirror(conanfile, cache, url, target, tag, commit, submodules)
+        return
+
+    git = Git(conanfile, folder=target)
+    if tag is not None:
+        args = ["--depth", "1", "--branch", tag]
+        if submodules is True:
+            args += ["--recursive", "--shallow-submodules"]
+        Git(conanfile).clone(url=url, args=args, target=target)
+    else:
+        os.makedirs(target, exist_ok=True)
+        git.fetch_commit(url=url, commit=commit)
+        if submodules is True:
+            git.run("submodule update --init --recursive --depth 1")
+    if submodules and submodules is not True:
+        paths = " ".join(f'"{path}"' for path in submodules)
+        git.run(f"submodule update --init --recursive --depth 1 -- {paths}")
+
+
+def git_checkout_submodules(conanfile, folder, paths, tags=None, destination=None):
+    """Check out the submodules in ``paths`` of the checkout in ``folder``, concurrently, at the
+    commit pinned by the superproject or at the tag given in ``tags``
+
+    Recipes whose configurations never build some submodules clone the superproject without
+    submodules and check out the others with this, nested submodules included. With
+    ``destination``, ``folder`` is left untouched: its files are hardlinked into ``destination``
+    and the submodules are checked out there. From build(), that assembles the tree of one
+    configuration in its build folder, served by the mirrors when the cache is enabled.
+    """
+    tags = tags or {}
+    submodules = git_submodules(conanfile, folder)
+    unknown = set(paths) - submodules.keys()
+    if unknown:
+        raise ConanException(f"{folder} has no submodule {', '.join(sorted(unknown))}")
+    if destination is not None:
+        shutil.rmtree(destination, ignore_errors=True)
+        link_tree(folder, destination, exclude=[".git"])
+    checkouts = []
+    for path in sorted(set(paths)):
+        url, commit = submodules[path]
+        ref = {"tag": tags[path]} if path in tags else {"commit": commit}
+        checkouts.append({"url": url, "target": os.path.join(destination or folder, path), "submodules": True, **ref})
+    git_clone_all(conanfile, checkouts)
+
+
+def git_clone_all(conanfile, checkouts):
+    """Run ``git_clone()`` for every dict of keyword arguments in ``checkouts``, concurrently"""
+    _run_concurrently(conanfile, [functools.partial(git_clone, conanfile, **checkout) for checkout in checkouts])
+
+
+def _stored_archive(conanfile, archives, url, sha256, filename, **kwargs):
+    """Verified archive with the given ``sha256``, downloaded only if the store lacks it"""
+    urls = url if isinstance(url, list) else [url]
+    filename = filename or os.path.basename(urls[0].split("?")[0])
+    archive = archive_path(archives, sha256, filename)
+    if not os.path.isfile(archive):
+        os.makedirs(os.path.dirname(archive), exist_ok=True)
+        staging = f"{archive}.{os.getpid()}"
+        files.download(conanfile, url, staging, sha256=sha256, **kwargs)
+        os.replace(staging, archive)
+    return archive
+
+
+def link_tree(source, destination, exclude=()):
+    """Hardlink every file of ``source`` into ``destination``, copying across filesystems
+
+    Conan's patch() writes patched files anew, so applying patches to the result never alters
+    ``source``. Top level entries named in ``exclude`` are skipped.
+    """
+    for root, dirs, filenames in os.walk(source):
+        if root == source:
+            dirs[:] = [name for name in dirs if name not in exclude]
+            filenames = [name for name in filenames if name not in exclude]
+        target = os.path.join(destination, os.path.relpath(root, source))
+        os.makedirs(target, exist_ok=True)
+        for name in dirs + filenames:
+            src, dst = os.path.join(root, name), os.path.join(target, name)
+            if os.path.islink(src):
+                if os.path.lexists(dst):
+                    os.unlink(dst)
+                os.symlink(os.readlink(src), dst)
+            elif name in filenames:
+                if os.path.lexists(dst):
+                    os.unlink(dst)
+                try:
+                    os.link(src, dst)
+                except OSError:
+                    shutil.copy2(src, dst)
+
+
+def download(conanfile, url, filename, sha256=None, **kwargs):
+    """Same as ``conan.tools.files.download()``, served from the archive store when the cache is enabled"""
+    archives = _cache_folder(conanfile, "archives")
+    if archives is None or not sha256:
+        files.download(conanfile, url, filename, sha256=sha256, **kwargs)
+        return
+    archive = _stored_archive(conanfile, archives, url, sha256, None, **kwargs)
+    if os.path.lexists(filename):
+        os.unlink(filename)
+    try:
+        os.link(archive, filename)
+    except OSError:
+        shutil.copy2(archive, filename)
+
+
+def get(conanfile, url, sha256=None, destination=".", filename="", strip_root=False, pattern=None, **kwargs):
+    """Same as ``conan.tools.files.get()``, keyed by ``sha256`` when the cache is enabled
+
+    Archives are stored once per sha256 and extracted once per sha256 and ``strip_root``. The
+    extracted tree is hardlinked into ``destination``, so a new recipe revision or a second recipe
+    using the same archive neither downloads nor extracts anything.
+    """
+    archives = _cache_folder(conanfile, "archives")
+    if archives is None or not sha256:
+        files.get(conanfile, url, sha256=sha256, destination=destination, filename=filename,
+                  strip_root=strip_root, pattern=pattern, **kwargs)
+        return
+    download_args = {key: kwargs.pop(key) for key in ("verify", "retry", "retry_wait", "auth", "headers") if key in kwargs}
+    archive = _stored_archive(conanfile, archives, url, sha256, filename, **download_args)
+    if pattern is not None:
+        files.unzip(conanfile, archive, destination=destination, pattern=pattern, strip_root=strip_root, **kwargs)
+        return
+    sha256 = sha256.lower()
+    tree = os.path.join(_cache_folder(conanfile, "trees"), f"{sha256}-stripped" if strip_root else sha256)
+    if not os.path.isdir(tree):
+        staging = f"{tree}.{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        files.unzip(conanfile, archive, destination=staging, strip_root=strip_root, **kwargs)
+        try:
+            os.rename(staging, tree)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+    link_tree(tree, destination)
+
+
+class source_cacheRecipe(ConanFile):
+    name = "source_cache"
+    package_type = "python-require"
@@ -1,36 +1,133 @@
 import os
 
 from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
+from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout
 from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
-from conan.tools.scm import Git
 
 required_conan_version = ">=2.20"
 
+# Implementations that can be compiled into a library of their own, with the macro selecting
+# the implementation in stb_<name>.h
+IMPLEMENTATIONS = {
+    "image": "STB_IMAGE_IMPLEMENTATION",
+    "image_write": "STB_IMAGE_WRITE_IMPLEMENTATION",
+    "image_resize2": "STB_IMAGE_RESIZE_IMPLEMENTATION",
+    "truetype": "STB_TRUETYPE_IMPLEMENTATION",
+    "rect_pack": "STB_RECT_PACK_IMPLEMENTATION",
+    "perlin": "STB_PERLIN_IMPLEMENTATION",
+    "sprintf": "STB_SPRINTF_IMPLEMENTATION",
+    "dxt": "STB_DXT_IMPLEMENTATION",
+    "ds": "STB_DS_IMPLEMENTATION",
+}
+# Implementations calling into libm
+MATH_IMPLEMENTATIONS = ("image", "image_resize2", "truetype", "perlin")
+
 class StbRecipe(ConanFile):
     name = "stb"
-    package_type = "header-library"
-    implements = ["auto_header_only"]
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
+    implements = ["auto_shared_fpic"]
     settings = "os", "arch", "compiler", "build_type"
 
+    options = {
+        "header_only": [True, False],
+        "shared": [True, False],
+        "fPIC": [True, False],
+        **{f"with_{name}": [True, False] for name in IMPLEMENTATIONS},
+    }
+
+    default_options = {
+        "header_only": True,
+        "shared": False,
+        "fPIC": True,
+        **{f"with_{name}": True for name in IMPLEMENTATIONS},
+    }
+
+    @property
+    def _implementations(self):
+        return [name for name in IMPLEMENTATIONS if self.options.get_safe(f"with_{name}")]
+
+    @property
+    def _simd(self):
+        if str(self.settings.arch).startswith(("armv7", "armv8")):
+            return "NEON"
+        if self.settings.arch in ("x86", "x86_64"):
+            return "SSE2"
+        return ""
+
     def export_sources(self):
         export_conandata_patches(self)
+        copy(self, "CMakeLists.txt", self.recipe_folder, self.export_sources_folder)
+
+    def configure(self):
+        if self.options.header_only:
+            self.package_type = "header-library"
+            self.options.rm_safe("shared")
+            self.options.rm_safe("fPIC")
+            for name in IMPLEMENTATIONS:
+                self.options.rm_safe(f"with_{name}")
+            return
+        self.package_type = "library"
+        if self.options.shared:
+            self.options.rm_safe("fPIC")
+        self.settings.rm_safe("compiler.cppstd")
+        self.settings.rm_safe("compiler.libcxx")
+
+    def layout(self):
+        cmake_layout(self, src_folder="src")
+
+    def package_id(self):
+        if self.info.options.header_only:
+            self.info.clear()
+
+    def validate(self):
+        if not self.options.header_only and not self._implementations:
+            raise ConanInvalidConfiguration(f"{self.ref} needs at least one with_* option enabled when header_only=False")
 
     def source(self):
         src_data = self.conan_data["sources"][self.version]
-        git = Git(self)
-        git.fetch_commit(url="https://github.com/nothings/stb.git", commit=src_data["commit"])
+        source_cache = self.python_requires["source_cache"].module
+        source_cache.git_clone(self, url="https://github.com/nothings/stb.git", commit=src_data["commit"],
+                               target=self.source_folder)
         apply_conandata_patches(self)
 
+    def generate(self):
+        if self.options.header_only:
+            return
+        tc = CMakeToolchain(self)
+        tc.cache_variables["STB_IMPLEMENTATIONS"] = ";".join(f"{name}={IMPLEMENTATIONS[name]}" for name in self._implementations)
+        tc.cache_variables["STB_SIMD"] = self._simd
+        tc.generate()
+
+    def build(self):
+        if self.options.header_only:
+            return
+        cmake = CMake(self)
+        cmake.configure(build_script_folder=os.path.join(self.source_folder, os.pardir))
+        cmake.build()
+
     def package(self):
         copy(self, "*.h", self.source_folder, os.path.join(self.package_folder, "include"))
         copy(self, "*.c", self.source_folder, os.path.join(self.package_folder, "include"),
             excludes=[ os.path.join(self.source_folder, "tests"), os.path.join(self.source_folder, "stb_image_resize_test") ]
         )
         copy(self, "LICENSE*", self.source_folder, os.path.join(self.package_folder, "licenses"))
+        if not self.options.header_only:
+            CMake(self).install()
 
     def package_info(self):
-        self.cpp_info.libdirs = []
-        self.cpp_info.bindirs = []
-
         self.cpp_info.set_property("cmake_file_name", "stb")
         self.cpp_info.set_property("cmake_target_name", "stb::stb")
+
+        if self.options.header_only:
+            self.cpp_info.libdirs = []
+            self.cpp_info.bindirs = []
+            return
+
+        for name in self._implementations:
+            component = self.cpp_info.components[name]
+            component.set_property("cmake_target_name", f"stb::{name}")
+            component.libs = [f"stb_{name}"]
+            if name in MATH_IMPLEMENTATIONS and self.settings.os in ("Linux", "FreeBSD"):
+                component.system_libs = ["m"]
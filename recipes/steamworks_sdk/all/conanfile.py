@@ -1,14 +1,28 @@
 import os
+import shutil
 
 from conan import ConanFile
-from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy, collect_libs
-from conan.tools.scm import Git
+from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
 from conan.errors import ConanInvalidConfiguration
 
 required_conan_version = ">=2.20"
 
+# Per (os, arch): folder of redistributable_bin with steam_api, folder of public/steam/lib with the
+# encrypted app ticket library, and the names of both libraries. Android has no app ticket library.
+PLATFORMS = {
+    ("Windows", "x86"): ("", "win32", "steam_api", "sdkencryptedappticket"),
+    ("Windows", "x86_64"): ("win64", "win64", "steam_api64", "sdkencryptedappticket64"),
+    ("Linux", "x86"): ("linux32", "linux32", "steam_api", "sdkencryptedappticket"),
+    ("Linux", "x86_64"): ("linux64", "linux64", "steam_api", "sdkencryptedappticket"),
+    ("Linux", "armv8"): ("linuxarm64", "linuxarm64", "steam_api", "sdkencryptedappticket"),
+    ("Macos", None): ("osx", "osx", "steam_api", "sdkencryptedappticket"),
+    ("Android", "armv8"): ("androidarm64", None, "steam_api", None),
+}
+
 class SteamworksSDKRecipe(ConanFile):
     name = "steamworks_sdk"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "shared-library"
     settings = "os", "arch", "compiler", "build_type"
     no_copy_source = True
@@ -16,89 +30,59 @@ class SteamworksSDKRecipe(ConanFile):
     def export_sources(self):
         export_conandata_patches(self)
 
-    def validate(self):
+    @property
+    def _platform(self):
+        # The macOS libraries are universal binaries
         os = str(self.settings.os)
-        arch = str(self.settings.arch)
-
-        if os == "Macos":
-            return
+        return PLATFORMS.get((os, None if os == "Macos" else str(self.settings.arch)))
 
-        supported = {
-            "Windows": ["x86", "x86_64"],
-            "Linux": ["x86", "x86_64", "armv8"],
-            "Android": ["armv8"],
-        }
+    def validate(self):
+        if self._platform is None:
+            raise ConanInvalidConfiguration(f"Unsupported configuration: {self.settings.os} / {self.settings.arch}")
 
-        if os not in supported or arch not in supported[os]:
-            raise ConanInvalidConfiguration(f"Unsupported configuration: {os} / {arch}")
+    def package_id(self):
+        # Prebuilt binaries, only the platform selects them
+        del self.info.settings.compiler
+        del self.info.settings.build_type
 
     def source(self):
         src_data = self.conan_data["sources"][self.version]
-        git = Git(self)
-        git.fetch_commit(url="https://github.com/rlabrecque/SteamworksSDK.git", commit=src_data["commit"])
+        source_cache = self.python_requires["source_cache"].module
+        source_cache.git_clone(self, url="https://github.com/rlabrecque/SteamworksSDK.git", commit=src_data["commit"],
+                               target=self.source_folder)
         apply_conandata_patches(self)
 
+    def _library_files(self, name):
+        if self.settings.os == "Windows":
+            return [(f"{name}.dll", "bin"), (f"{name}.lib", "lib")]
+        extension = "dylib" if self.settings.os == "Macos" else "so"
+        return [(f"lib{name}.{extension}", "lib")]
+
     def package(self):
         copy(self, pattern="*.h", src=os.path.join(self.source_folder, "public"), dst=os.path.join(self.package_folder, "include"))
         copy(self, pattern="*.json", src=os.path.join(self.source_folder, "public"), dst=os.path.join(self.package_folder, "include"))
 
-        copy(self, pattern="*.so", src=os.path.join(self.source_folder, "redistributable_bin"), dst=os.path.join(self.package_folder, "lib"))
-        copy(self, pattern="*.dylib", src=os.path.join(self.source_folder, "redistributable_bin"), dst=os.path.join(self.package_folder, "lib"))
-        copy(self, pattern="*.lib", src=os.path.join(self.source_folder, "redistributable_bin"), dst=os.path.join(self.package_folder, "lib"))
-        copy(self, pattern="*.dll", src=os.path.join(self.source_folder, "redistributable_bin"), dst=os.path.join(self.package_folder, "bin"))
-
-        copy(self, pattern="*.so", src=os.path.join(self.source_folder, "public", "steam", "lib"), dst=os.path.join(self.package_folder, "lib"))
-        copy(self, pattern="*.dylib", src=os.path.join(self.source_folder, "public", "steam", "lib"), dst=os.path.join(self.package_folder, "lib"))
-        copy(self, pattern="*.lib", src=os.path.join(self.source_folder, "public", "steam", "lib"), dst=os.path.join(self.package_folder, "lib"))
-        copy(self, pattern="*.dll", src=os.path.join(self.source_folder, "public", "steam", "lib"), dst=os.path.join(self.package_folder, "bin"))
+        api_folder, ticket_folder, api_lib, ticket_lib = self._platform
+        libraries = [(os.path.join(self.source_folder, "redistributable_bin", api_folder), api_lib)]
+        if ticket_lib:
+            libraries.append((os.path.join(self.source_folder, "public", "steam", "lib", ticket_folder), ticket_lib))
+        for folder, name in libraries:
+            for filename, destination in self._library_files(name):
+                os.makedirs(os.path.join(self.package_folder, destination), exist_ok=True)
+                shutil.copy2(os.path.join(folder, filename), os.path.join(self.package_folder, destination, filename))
 
     def package_info(self):
         self.cpp_info.set_property("cmake_file_name", "SteamworksSDK")
         self.cpp_info.set_property("cmake_target_name", "SteamworksSDK::SteamworksSDK")
-
-        self.cpp_info.bindirs = []
-        self.cpp_info.libdirs = []
-
-        if str(self.settings.os).startswith("Windows"):
-            if self.settings.arch == "x86_64":
-                self.cpp_info.bindirs.append(os.path.join("bin", "win64"))
-                self.cpp_info.libdirs.append(os.path.join("lib", "win64"))
-            elif self.settings.arch == "x86":
-                self.cpp_info.bindirs.append("bin")
-                self.cpp_info.libdirs.append("lib")
-                self.cpp_info.bindirs.append(os.path.join("bin", "win32"))
-                self.cpp_info.libdirs.append(os.path.join("lib", "win32"))
-
-        elif self.settings.os == "Linux":
-            if self.settings.arch == "x86_64":
-                self.cpp_info.bindirs.append(os.path.join("bin", "linux64"))
-                self.cpp_info.libdirs.append(os.path.join("lib", "linux64"))
-            elif self.settings.arch == "x86":
-                self.cpp_info.bindirs.append(os.path.join("bin", "linux32"))
-                self.cpp_info.libdirs.append(os.path.join("lib", "linux32"))
-            elif self.settings.arch == "armv8":
-                self.cpp_info.bindirs.append(os.path.join("bin", "linuxarm64"))
-                self.cpp_info.libdirs.append(os.path.join("lib", "linuxarm64"))
-
-        elif self.settings.os == "Macos":
-            self.cpp_info.bindirs.append(os.path.join("bin", "osx"))
-            self.cpp_info.libdirs.append(os.path.join("lib", "osx"))
-
-        elif self.settings.os == "Android" and self.settings.arch == "armv8":
-            self.cpp_info.bindirs.append(os.path.join("bin", "androidarm64"))
-            self.cpp_info.libdirs.append(os.path.join("lib", "androidarm64"))
+        _, _, api_lib, ticket_lib = self._platform
 
         component_api = self.cpp_info.components["SteamAPI"]
         component_api.set_property("cmake_target_name", "SteamworksSDK::SteamAPI")
-        component_api.libs = [next(x for x in collect_libs(self) if "steam_api" in x)]
-        component_api.bindirs = self.cpp_info.bindirs
-        component_api.libdirs = self.cpp_info.libdirs
+        component_api.libs = [api_lib]
 
-        if self.settings.os != "Android":
+        if ticket_lib:
             component_ticket = self.cpp_info.components["AppTicket"]
             component_ticket.set_property("cmake_target_name", "SteamworksSDK::AppTicket")
-            component_ticket.libs = [next(x for x in collect_libs(self) if "sdkencryptedappticket" in x)]
-            component_ticket.bindirs = self.cpp_info.bindirs
-            component_ticket.libdirs = self.cpp_info.libdirs
+            component_ticket.libs = [ticket_lib]
             component_ticket.set_property("nosoname", True)
             component_ticket.requires = ["SteamAPI"]
@@ -1,29 +1,57 @@
 import os
 
 from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
 from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout, CMakeConfigDeps
-from conan.tools.files import apply_conandata_patches, export_conandata_patches, get, load, replace_in_file
+from conan.tools.files import apply_conandata_patches, collect_libs, copy, export_conandata_patches, load, replace_in_file, save
 
 required_conan_version = ">=2.20"
 
+# Included by the upstream config file, declares the target of the header-only optimized loader
+OPTIMIZED_TARGET_MODULE = """\
+if(NOT TARGET tinyobjloader::optimized)
+    include(CMakeFindDependencyMacro)
+    find_dependency(Threads)
+    add_library(tinyobjloader::optimized INTERFACE IMPORTED)
+    set_target_properties(tinyobjloader::optimized PROPERTIES
+        INTERFACE_LINK_LIBRARIES "tinyobjloader::tinyobjloader;Threads::Threads")
+endif()
+"""
+
 class tinyobjloaderRecipe(ConanFile):
     name = "tinyobjloader"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "static-library"
     settings = "os", "arch", "compiler", "build_type"
 
     options = {
         "double": [True, False],
+        "with_opt_loader": [True, False],
+        "opt_loader_threads": ["ANY"],
     }
 
     default_options = {
         "double": False,
+        "with_opt_loader": False,
+        # Default thread count of the optimized loader, -1 uses std::thread::hardware_concurrency()
+        "opt_loader_threads": "-1",
     }
 
+    def configure(self):
+        if not self.options.with_opt_loader:
+            self.options.rm_safe("opt_loader_threads")
+
+    def validate(self):
+        if self.options.with_opt_loader and not str(self.options.opt_loader_threads).lstrip("-").isdigit():
+            raise ConanInvalidConfiguration(f"{self.ref} opt_loader_threads must be an integer, got {self.options.opt_loader_threads}")
+
     def export_sources(self):
         export_conandata_patches(self)
 
     def source(self):
-        get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
+        source_cache = self.python_requires["source_cache"].module
+        source_cache.get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
         apply_conandata_patches(self)
 
     def layout(self):
@@ -49,6 +77,8 @@ class tinyobjloaderRecipe(ConanFile):
         cmake = CMake(self)
         cmake.install()
         self._remove_implementation(os.path.join(self.package_folder, "include", "tiny_obj_loader.h"))
+        if self.options.with_opt_loader:
+            self._package_opt_loader()
 
     def _remove_implementation(self, header_fullpath):
         header_content = load(self, header_fullpath)
@@ -56,7 +86,32 @@ class tinyobjloaderRecipe(ConanFile):
         implementation = header_content[begin:-1]
         replace_in_file(self, header_fullpath, implementation, "")
 
+    def _package_opt_loader(self):
+        # The experimental multithreaded parser stays header-only, consumers define
+        # TINYOBJ_LOADER_OPT_IMPLEMENTATION in one TU as upstream documents
+        copy(self, "tinyobj_loader_opt.h", os.path.join(self.source_folder, "experimental"),
+             os.path.join(self.package_folder, "include"))
+        header = os.path.join(self.package_folder, "include", "tinyobj_loader_opt.h")
+        replace_in_file(self, header, "req_num_threads(-1)", "req_num_threads(TINYOBJ_LOADER_OPT_NUM_THREADS)")
+        save(self, header, f"#ifndef TINYOBJ_LOADER_OPT_NUM_THREADS\n"
+                           f"#define TINYOBJ_LOADER_OPT_NUM_THREADS ({self.options.opt_loader_threads})\n"
+                           f"#endif\n" + load(self, header))
+        cmake_folder = os.path.join(self.package_folder, "lib", "tinyobjloader", "cmake")
+        save(self, os.path.join(cmake_folder, "tinyobjloader-optimized.cmake"), OPTIMIZED_TARGET_MODULE)
+        config = os.path.join(cmake_folder, "tinyobjloader-config.cmake")
+        save(self, config, load(self, config) + '\ninclude("${CMAKE_CURRENT_LIST_DIR}/tinyobjloader-optimized.cmake")\n')
+
     def package_info(self):
         self.cpp_info.set_property("cmake_find_mode", "none")
         self.cpp_info.set_property("cmake_file_name", "tinyobjloader")
-        self.cpp_info.builddirs = [os.path.join("lib", "tinyobjloader", "cmake")]
+        core = self.cpp_info.components["tinyobjloader"]
+        core.set_property("cmake_target_name", "tinyobjloader::tinyobjloader")
+        core.libs = collect_libs(self)
+        core.builddirs = [os.path.join("lib", "tinyobjloader", "cmake")]
+        if self.options.with_opt_loader:
+            optimized = self.cpp_info.components["optimized"]
+            optimized.set_property("cmake_target_name", "tinyobjloader::optimized")
+            optimized.libdirs = []
+            optimized.requires = ["tinyobjloader"]
+            if self.settings.os in ("Linux", "FreeBSD"):
+                optimized.system_libs = ["pthread"]
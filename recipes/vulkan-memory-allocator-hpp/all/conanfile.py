@@ -2,13 +2,15 @@ import os
 
 from conan import ConanFile
 from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout
-from conan.tools.files import apply_conandata_patches, export_conandata_patches, get, copy
+from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
 from conan.tools.scm import Version
 
 required_conan_version = ">=2.20"
 
 class VulkanMemoryAllocatorHppRecipe(ConanFile):
     name = "vulkan-memory-allocator-hpp"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "header-library"
     implements = ["auto_header_only"]
     settings = "os", "arch", "compiler", "build_type"
@@ -21,7 +23,8 @@ class VulkanMemoryAllocatorHppRecipe(ConanFile):
         self.requires(f"vulkan-memory-allocator/{".".join(map(str, Version(self.version).main))}")
 
     def source(self):
-        get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
+        source_cache = self.python_requires["source_cache"].module
+        source_cache.get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
         apply_conandata_patches(self)
 
     def layout(self):
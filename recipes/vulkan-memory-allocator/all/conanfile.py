@@ -1,25 +1,102 @@
 import os
 
 from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
 from conan.tools.cmake import CMakeToolchain, CMake, cmake_layout
-from conan.tools.files import apply_conandata_patches, export_conandata_patches, get, copy
+from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
 
 required_conan_version = ">=2.20"
 
+# Options of the compiled library and the VMA_* macro each of them sets
+MACRO_OPTIONS = {
+    "static_vulkan_functions": "VMA_STATIC_VULKAN_FUNCTIONS",
+    "dynamic_vulkan_functions": "VMA_DYNAMIC_VULKAN_FUNCTIONS",
+    "stats_string_enabled": "VMA_STATS_STRING_ENABLED",
+    "debug_margin": "VMA_DEBUG_MARGIN",
+    "debug_initialize_allocations": "VMA_DEBUG_INITIALIZE_ALLOCATIONS",
+    "debug_detect_corruption": "VMA_DEBUG_DETECT_CORRUPTION",
+    "debug_always_dedicated_memory": "VMA_DEBUG_ALWAYS_DEDICATED_MEMORY",
+    "debug_global_mutex": "VMA_DEBUG_GLOBAL_MUTEX",
+}
+
 class VulkanMemoryAllocatorRecipe(ConanFile):
     name = "vulkan-memory-allocator"
-    package_type = "header-library"
-    implements = ["auto_header_only"]
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
+    implements = ["auto_shared_fpic"]
     settings = "os", "arch", "compiler", "build_type"
 
+    options = {
+        "header_only": [True, False],
+        "shared": [True, False],
+        "fPIC": [True, False],
+        # Statically linked vkXxx functions need the Vulkan loader at link time, so by default the
+        # library only fetches them through the vkGetInstanceProcAddr given in VmaVulkanFunctions
+        "static_vulkan_functions": [True, False],
+        "dynamic_vulkan_functions": [True, False],
+        "stats_string_enabled": [True, False],
+        "debug_margin": ["ANY"],
+        "debug_initialize_allocations": [True, False],
+        "debug_detect_corruption": [True, False],
+        "debug_always_dedicated_memory": [True, False],
+        "debug_global_mutex": [True, False],
+    }
+
+    default_options = {
+        "header_only": True,
+        "shared": False,
+        "fPIC": True,
+        "static_vulkan_functions": False,
+        "dynamic_vulkan_functions": True,
+        "stats_string_enabled": True,
+        "debug_margin": "0",
+        "debug_initialize_allocations": False,
+        "debug_detect_corruption": False,
+        "debug_always_dedicated_memory": False,
+        "debug_global_mutex": False,
+    }
+
+    @property
+    def _vma_definitions(self):
+        definitions = {}
+        for option, macro in MACRO_OPTIONS.items():
+            value = str(self.options.get_safe(option))
+            definitions[macro] = {"True": "1", "False": "0"}.get(value, value)
+        return definitions
+
     def export_sources(self):
         export_conandata_patches(self)
+        copy(self, "CMakeLists.txt", self.recipe_folder, self.export_sources_folder)
+
+    def configure(self):
+        if self.options.header_only:
+            self.package_type = "header-library"
+            self.options.rm_safe("shared")
+            self.options.rm_safe("fPIC")
+            for option in MACRO_OPTIONS:
+                self.options.rm_safe(option)
+            return
+        self.package_type = "library"
+        if self.options.shared:
+            self.options.rm_safe("fPIC")
 
     def requirements(self):
-        self.requires("vulkan-headers/[*]")
+        self.requires("vulkan-headers/[*]", transitive_headers=True)
+
+    def package_id(self):
+        if self.info.options.header_only:
+            self.info.clear()
+
+    def validate(self):
+        if not self.options.header_only:
+            if not str(self.options.debug_margin).isdigit() or int(self.options.debug_margin) % 4:
+                raise ConanInvalidConfiguration(f"{self.ref} debug_margin must be a multiple of 4, got {self.options.debug_margin}")
+            if self.options.debug_detect_corruption and not int(self.options.debug_margin):
+                raise ConanInvalidConfiguration(f"{self.ref} debug_detect_corruption needs a non-zero debug_margin")
 
     def source(self):
-        get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
+        source_cache = self.python_requires["source_cache"].module
+        source_cache.get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
         apply_conandata_patches(self)
 
     def layout(self):
@@ -27,14 +104,22 @@ class VulkanMemoryAllocatorRecipe(ConanFile):
 
     def generate(self):
         tc = CMakeToolchain(self)
-        tc.cache_variables["VMA_ENABLE_INSTALL"] = True
-        tc.cache_variables["VMA_BUILD_DOCUMENTATION"] = False
-        tc.cache_variables["VMA_BUILD_SAMPLES"] = False
+        if self.options.header_only:
+            tc.cache_variables["VMA_ENABLE_INSTALL"] = True
+            tc.cache_variables["VMA_BUILD_DOCUMENTATION"] = False
+            tc.cache_variables["VMA_BUILD_SAMPLES"] = False
+        else:
+            for key, value in self._vma_definitions.items():
+                tc.preprocessor_definitions[key] = value
         tc.generate()
 
     def build(self):
         cmake = CMake(self)
-        cmake.configure()
+        if self.options.header_only:
+            cmake.configure()
+            return
+        cmake.configure(build_script_folder=os.path.join(self.source_folder, os.pardir))
+        cmake.build()
 
     def package(self):
         cmake = CMake(self)
@@ -42,6 +127,15 @@ class VulkanMemoryAllocatorRecipe(ConanFile):
         copy(self, "LICENSE*", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
 
     def package_info(self):
-        self.cpp_info.set_property("cmake_find_mode", "none")
         self.cpp_info.set_property("cmake_file_name", "VulkanMemoryAllocator")
-        self.cpp_info.builddirs = [os.path.join("share", "cmake", "VulkanMemoryAllocator")]
+        if self.options.header_only:
+            self.cpp_info.set_property("cmake_find_mode", "none")
+            self.cpp_info.builddirs = [os.path.join("share", "cmake", "VulkanMemoryAllocator")]
+            return
+
+        # Same target as upstream's config, which only exists for the header-only package
+        self.cpp_info.set_property("cmake_target_name", "GPUOpen::VulkanMemoryAllocator")
+        self.cpp_info.libs = ["VulkanMemoryAllocator"]
+        self.cpp_info.defines = [f"{key}={value}" for key, value in self._vma_definitions.items()]
+        if self.settings.os in ("Linux", "FreeBSD"):
+            self.cpp_info.system_libs = ["pthread"]
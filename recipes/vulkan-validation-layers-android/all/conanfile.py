@@ -1,22 +1,60 @@
+import os
+
 from conan import ConanFile
-from conan.tools.files import apply_conandata_patches, export_conandata_patches, get, copy
+from conan.errors import ConanInvalidConfiguration
+from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy
 
 required_conan_version = ">=2.20"
 
+# Android ABI directory for each Conan arch
+ABIS = {
+    "armv8": "arm64-v8a",
+    "armv7": "armeabi-v7a",
+    "armv7hf": "armeabi-v7a",
+    "x86": "x86",
+    "x86_64": "x86_64",
+}
+
 class VulkanValidationLayersAndroidRecipe(ConanFile):
     name = "vulkan-validation-layers-android"
+    python_requires = "source_cache/1.0"
+    package_id_python_mode = "unrelated_mode"
     package_type = "unknown"
+    settings = "os", "arch"
     no_copy_source = True
 
+    @property
+    def _abi(self):
+        return ABIS.get(str(self.settings.arch))
+
+    @property
+    def _jnilibs_folder(self):
+        return os.path.join("jniLibs", self._abi)
+
     def export_sources(self):
         export_conandata_patches(self)
 
+    def validate(self):
+        if self.settings.os != "Android" or self._abi is None:
+            raise ConanInvalidConfiguration(f"Unsupported configuration: {self.settings.os} / {self.settings.arch}")
+
     def source(self):
-        get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
+        source_cache = self.python_requires["source_cache"].module
+        source_cache.get(self, **self.conan_data["sources"][self.version], destination=self.source_folder, strip_root=True)
         apply_conandata_patches(self)
 
     def package(self):
-        copy(self, "*", self.source_folder, self.package_folder)
+        # The ABI folders sit at the top of the archive or below jniLibs/, depending on the release
+        src = os.path.join(self.source_folder, self._jnilibs_folder)
+        if not os.path.isdir(src):
+            src = os.path.join(self.source_folder, self._abi)
+        copy(self, "*.so", src, os.path.join(self.package_folder, self._jnilibs_folder))
+        copy(self, "LICENSE*", self.source_folder, os.path.join(self.package_folder, "licenses"), keep_path=False)
 
     def package_info(self):
         self.cpp_info.set_property("cmake_find_mode", "none")
+        # The layers are loaded by the Vulkan loader from the APK and never linked, so only their
+        # location is exposed, e.g. for copying them into the jniLibs of an application
+        self.cpp_info.includedirs = []
+        self.cpp_info.libdirs = [self._jnilibs_folder]
+        self.cpp_info.bindirs = [self._jnilibs_folder]
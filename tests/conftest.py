@@ -0,0 +1,83 @@
+import json
+import os
+import shutil
+import subprocess
+import textwrap
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Recipe running the source() body given to the run_source fixture
+RECIPE = """import os
+
+from conan import ConanFile
+from conan.tools.files import patch
+
+
+class ConsumerRecipe(ConanFile):
+    name = "consumer"
+    version = "1.0"
+    python_requires = "source_cache/1.0"
+
+    def source(self):
+        source_cache = self.python_requires["source_cache"].module
+{body}
+"""
+
+
+@pytest.fixture(scope="session")
+def conan(tmp_path_factory):
+    """Runs the conan CLI against a fresh CONAN_HOME that already holds the source_cache python_requires"""
+    if shutil.which("conan") is None:
+        pytest.skip("conan is not installed")
+    home = tmp_path_factory.mktemp("conan_home")
+    env = dict(os.environ, CONAN_HOME=str(home))
+
+    def run(*args):
+        return subprocess.run(["conan", *args], env=env, check=True, capture_output=True, text=True).stdout
+
+    run.home = home
+    run("profile", "detect")
+    run("export", os.path.join(ROOT, "recipes", "source_cache", "all"), "--version", "1.0")
+    return run
+
+
+@pytest.fixture(scope="session")
+def package_id(conan):
+    """Package id of the root recipe as computed by `conan graph info`"""
+
+    def compute(recipe, version, options=(), settings=()):
+        args = ["graph", "info", os.path.join(ROOT, "recipes", recipe, "all"), "--version", version, "--format", "json"]
+        for option in options:
+            args += ["-o", f"{recipe}/*:{option}"]
+        for setting in settings:
+            args += ["-s", setting]
+        return json.loads(conan(*args))["graph"]["nodes"]["0"]["package_id"]
+
+    return compute
+
+
+@pytest.fixture
+def source_cache(conan, tmp_path):
+    """Cache folder enabled through the global.conf of the test CONAN_HOME"""
+    folder = tmp_path / "source_cache"
+    global_conf = conan.home / "global.conf"
+    previous = global_conf.read_text() if global_conf.is_file() else ""
+    global_conf.write_text(f"{previous}\nuser.source_cache:folder={folder}\n")
+    yield folder
+    global_conf.write_text(previous)
+
+
+@pytest.fixture
+def run_source(conan, tmp_path):
+    """Runs the source() of a recipe made of ``body`` and returns its source folder"""
+
+    def run(name, body):
+        folder = tmp_path / name
+        folder.mkdir()
+        (folder / "conanfile.py").write_text(RECIPE.format(body=textwrap.indent(textwrap.dedent(body).strip(), " " * 8)))
+        conan("source", str(folder))
+        return folder
+
+    return run
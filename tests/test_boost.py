@@ -0,0 +1,137 @@
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import textwrap
+
+import pytest
+
+RECIPE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "recipes", "boost", "all")
+VERSION = "1.92.0"
+
+
+def boost_package_id(package_id, *options, settings=()):
+    return package_id("boost", VERSION, options, settings)
+
+
+def test_header_only_package_id_ignores_settings(package_id):
+    options = ("header_only=True", "with_mp11=True")
+    release = boost_package_id(package_id, *options, settings=["build_type=Release"])
+    debug = boost_package_id(package_id, *options, settings=["build_type=Debug"])
+    assert release == debug
+
+
+def test_equivalent_selections_share_package_id(package_id):
+    # atomic and mp11 are in the dependency closure of filesystem, hana is not
+    spellings = [
+        ("with_filesystem=True",),
+        ("with_filesystem=True", "with_atomic=True"),
+        ("with_filesystem=True", "with_mp11=True", "without_hana=True"),
+    ]
+    assert len({boost_package_id(package_id, *options) for options in spellings}) == 1
+
+
+def test_different_header_sets_change_package_id(package_id):
+    # Only the headers of the resolved libraries are installed
+    assert boost_package_id(package_id) != boost_package_id(package_id, "without_hana=True")
+    assert boost_package_id(package_id, "with_filesystem=True") != \
+        boost_package_id(package_id, "with_filesystem=True", "with_hana=True")
+
+
+def test_different_compiled_libraries_change_package_id(package_id):
+    assert boost_package_id(package_id, "with_filesystem=True") != boost_package_id(package_id, "with_json=True")
+
+
+def test_asio_options_ignored_without_asio(package_id):
+    assert boost_package_id(package_id, "with_filesystem=True") == \
+        boost_package_id(package_id, "with_filesystem=True", "asio_io_uring=True", "asio_disable_epoll=True")
+
+
+def test_header_only_modules_conflict_is_explained(conan):
+    graph = json.loads(conan("graph", "info", RECIPE, "--version", VERSION, "--format", "json",
+                             "-o", "boost/*:header_only=True", "-o", "boost/*:use_modules=True",
+                             "-o", "boost/*:with_mp11=True", "-s", "compiler.cppstd=20"))
+    assert "conflicts with boost:use_modules=True" in graph["graph"]["nodes"]["0"]["info_invalid"]
+
+
+@pytest.fixture
+def recipe_module():
+    pytest.importorskip("conan")
+    if shutil.which("cmake") is None:
+        pytest.skip("cmake is not installed")
+    spec = importlib.util.spec_from_file_location("boost_conanfile", os.path.join(RECIPE, "conanfile.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def liburing_config(tmp_path):
+    """Stand-in for the liburing package, a header and a config declaring liburing::liburing"""
+    include = tmp_path / "liburing" / "include"
+    include.mkdir(parents=True)
+    (include / "liburing.h").write_text("#define LIBURING_STANDIN 1\n")
+    (tmp_path / "liburing" / "liburing-config.cmake").write_text(textwrap.dedent(f"""\
+        if(NOT TARGET liburing::liburing)
+            add_library(liburing::liburing INTERFACE IMPORTED)
+            set_target_properties(liburing::liburing PROPERTIES INTERFACE_INCLUDE_DIRECTORIES "{include.as_posix()}")
+        endif()
+        """))
+    return tmp_path / "liburing"
+
+
+def cmake_build(source, *definitions):
+    build = source / "build"
+    subprocess.run(["cmake", "-S", source, "-B", build, *(f"-D{definition}" for definition in definitions)],
+                   check=True, capture_output=True, text=True)
+    subprocess.run(["cmake", "--build", build], check=True, capture_output=True, text=True)
+
+
+def test_asio_io_uring_build_finds_liburing(tmp_path, recipe_module, liburing_config):
+    project_include = tmp_path / "boost_asio_io_uring.cmake"
+    project_include.write_text(recipe_module.ASIO_IO_URING_PROJECT_INCLUDE)
+    source = tmp_path / "boost"
+    source.mkdir()
+    (source / "CMakeLists.txt").write_text(textwrap.dedent("""\
+        cmake_minimum_required(VERSION 3.16)
+        project(Boost LANGUAGES CXX)
+        add_library(boost_process STATIC process.cpp)
+        """))
+    (source / "process.cpp").write_text("#include <liburing.h>\nint process() { return LIBURING_STANDIN; }\n")
+    cmake_build(source, f"CMAKE_PROJECT_Boost_INCLUDE={project_include.as_posix()}", f"liburing_DIR={liburing_config.as_posix()}")
+
+
+def test_asio_io_uring_definitions_reach_cmake_consumers(tmp_path, recipe_module, liburing_config):
+    config_folder = tmp_path / "package" / "lib" / "cmake" / "Boost-1.92.0"
+    config_folder.mkdir(parents=True)
+    definitions = {"BOOST_ASIO_HAS_IO_URING": "1", "BOOST_ASIO_DISABLE_EPOLL": "1"}
+    (config_folder / "BoostAsioIoUring.cmake").write_text(recipe_module.BoostRecipe._asio_io_uring_config(definitions))
+    # Boost's own config, followed by the include package() appends
+    (config_folder / "BoostConfig.cmake").write_text(textwrap.dedent("""\
+        if(NOT TARGET Boost::headers)
+            add_library(Boost::headers INTERFACE IMPORTED)
+            add_library(Boost::asio INTERFACE IMPORTED)
+            set_target_properties(Boost::asio PROPERTIES INTERFACE_LINK_LIBRARIES Boost::headers)
+        endif()
+
+        include("${CMAKE_CURRENT_LIST_DIR}/BoostAsioIoUring.cmake")
+        """))
+    consumer = tmp_path / "consumer"
+    consumer.mkdir()
+    (consumer / "CMakeLists.txt").write_text(textwrap.dedent("""\
+        cmake_minimum_required(VERSION 3.16)
+        project(consumer LANGUAGES CXX)
+        find_package(Boost CONFIG REQUIRED)
+        find_package(Boost CONFIG REQUIRED)
+        add_executable(consumer main.cpp)
+        target_link_libraries(consumer PRIVATE Boost::asio)
+        """))
+    (consumer / "main.cpp").write_text(textwrap.dedent("""\
+        #include <liburing.h>
+        #if BOOST_ASIO_HAS_IO_URING != 1 || BOOST_ASIO_DISABLE_EPOLL != 1
+        #error "Boost.Asio definitions missing"
+        #endif
+        int main() { return LIBURING_STANDIN - 1; }
+        """))
+    cmake_build(consumer, f"Boost_DIR={config_folder.as_posix()}", f"liburing_DIR={liburing_config.as_posix()}")
@@ -0,0 +1,145 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+
+from conftest import ROOT
+
+RECIPE = os.path.join(ROOT, "recipes", "slang_shaders", "all")
+
+# Resolves `import x;` and `#include "x"` against the shader's folder then -I folders, like slangc,
+# and writes their concatenation plus a depfile listing them
+SLANGC = '''\
+import os
+import re
+import sys
+
+args = sys.argv[1:]
+if args == ["-version"]:
+    print("stub-slangc 1.0")
+    sys.exit()
+source, include_dirs, depfile, output = args[0], [], None, None
+for flag, value in zip(args, args[1:]):
+    if flag == "-I":
+        include_dirs.append(value)
+    elif flag == "-depfile":
+        depfile = value
+    elif flag == "-o":
+        output = value
+with open(os.environ["STUB_SLANGC_LOG"], "a") as log:
+    log.write(os.path.basename(source) + "\\n")
+files = []
+
+def load(path):
+    files.append(path)
+    content = open(path).read()
+    for name in re.findall(r'^(?:import (\\w+);|#include "(.+)")', content, re.M):
+        name = name[0] + ".slang" if name[0] else name[1]
+        for folder in [os.path.dirname(path)] + include_dirs:
+            if os.path.isfile(os.path.join(folder, name)):
+                content += load(os.path.join(folder, name))
+                break
+    return content
+
+with open(output, "w") as f:
+    f.write(load(source))
+with open(depfile, "w") as f:
+    f.write(output.replace(" ", "\\\\ ") + ": \\\\\\n " + " \\\\\\n ".join(path.replace(" ", "\\\\ ") for path in files) + "\\n")
+'''
+
+
+class Conf:
+    def __init__(self, values):
+        self._values = values
+
+    def get(self, name, default=None, check_type=None):
+        return self._values.get(name, default)
+
+
+@pytest.fixture
+def recipe_module():
+    pytest.importorskip("conan")
+    spec = importlib.util.spec_from_file_location("slang_shaders_conanfile", os.path.join(RECIPE, "conanfile.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def compile_shaders(tmp_path, monkeypatch, recipe_module):
+    """compile_shaders() of a fake package built with the stub slangc, and the shaders it compiled"""
+    slangc = tmp_path / "slangc"
+    slangc.write_text(f"#!{sys.executable}\n{SLANGC}")
+    slangc.chmod(0o755)
+    log = tmp_path / "slangc.log"
+    log.touch()
+    monkeypatch.setenv("STUB_SLANGC_LOG", str(log))
+    monkeypatch.setattr(recipe_module, "slangc_path", lambda conanfile: str(slangc))
+
+    def run(command, stdout=None, stderr=None, quiet=False):
+        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        if stdout is not None:
+            stdout.write(result.stdout)
+
+    def compile_shaders(name, shaders, **kwargs):
+        conanfile = types.SimpleNamespace(source_folder=str(tmp_path / "src"), build_folder=str(tmp_path / name),
+                                          conf=Conf({recipe_module.CACHE_FOLDER_CONF: str(tmp_path / "cache"),
+                                                     "tools.build:jobs": 2}),
+                                          run=run)
+        log.write_text("")
+        outputs = recipe_module.compile_shaders(conanfile, shaders, str(tmp_path / name / "shaders"), **kwargs)
+        return [open(output).read() for output in outputs], sorted(log.read_text().split())
+
+    return compile_shaders
+
+
+@pytest.fixture
+def sources(tmp_path):
+    files = {
+        "shaders/lit.slang": "import lighting;\nlit\n",
+        "shaders/lighting.slang": "lighting\n",
+        "shaders/unlit.slang": '#include "common.h"\nunlit\n',
+        "include/common.h": "common\n",
+    }
+    for name, content in files.items():
+        path = tmp_path / "src" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path / "src"
+
+
+SHADERS = ["shaders/lit.slang", "shaders/unlit.slang"]
+
+
+def test_unchanged_shaders_come_from_cache(compile_shaders, sources):
+    first, compiled = compile_shaders("first", SHADERS, include_dirs=["include"])
+    assert compiled == ["lit.slang", "unlit.slang"]
+
+    second, compiled = compile_shaders("second", SHADERS, include_dirs=["include"])
+    assert compiled == []
+    assert second == first == ["import lighting;\nlit\nlighting\n", '#include "common.h"\nunlit\ncommon\n']
+
+
+def test_arguments_are_part_of_the_key(compile_shaders, sources):
+    compile_shaders("first", SHADERS, include_dirs=["include"])
+    _, compiled = compile_shaders("defines", SHADERS, include_dirs=["include"], defines={"FAST": None})
+    assert compiled == ["lit.slang", "unlit.slang"]
+
+
+@pytest.mark.parametrize("dependency, invalidated", [("shaders/lighting.slang", "lit.slang"),
+                                                     ("include/common.h", "unlit.slang")])
+def test_edited_dependency_invalidates_its_shaders(compile_shaders, sources, dependency, invalidated):
+    compile_shaders("first", SHADERS, include_dirs=["include"])
+    (sources / dependency).write_text("edited\n")
+
+    outputs, compiled = compile_shaders("second", SHADERS, include_dirs=["include"])
+    assert compiled == [invalidated]
+    assert sum("edited\n" in output for output in outputs) == 1
+
+    # Both versions of the dependency stay cached
+    (sources / dependency).write_text(dependency.split("/")[1].split(".")[0] + "\n")
+    _, compiled = compile_shaders("third", SHADERS, include_dirs=["include"])
+    assert compiled == []
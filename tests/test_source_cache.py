@@ -0,0 +1,91 @@
+import hashlib
+import http.server
+import io
+import tarfile
+import threading
+
+import pytest
+
+PATCH = """--- a/a.txt
++++ b/a.txt
+@@ -1 +1 @@
+-a
++patched
+"""
+
+
+@pytest.fixture
+def archive_server(tmp_path):
+    """Local HTTP server for the folder it returns, with the list of paths requested from it"""
+    root = tmp_path / "www"
+    root.mkdir()
+    requests = []
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(root), **kwargs)
+
+        def do_GET(self):
+            requests.append(self.path)
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield root, f"http://127.0.0.1:{server.server_port}", requests
+    server.shutdown()
+
+
+def make_archive(path, files):
+    with tarfile.open(path, "w:gz") as tar:
+        for name, content in files.items():
+            data = content.encode()
+            info = tarfile.TarInfo(f"project-1.0/{name}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_archive_downloaded_and_extracted_once(run_source, source_cache, archive_server):
+    root, url, requests = archive_server
+    sha256 = make_archive(root / "project.tar.gz", {"a.txt": "a\n", "sub/b.txt": "b\n"})
+    body = f'source_cache.get(self, url="{url}/project.tar.gz", sha256="{sha256}", strip_root=True)'
+
+    first = run_source("first", body)
+    second = run_source("second", body)
+
+    assert requests == ["/project.tar.gz"]
+    assert (source_cache / "archives" / sha256 / "project.tar.gz").is_file()
+    tree = source_cache / "trees" / f"{sha256}-stripped"
+    for name in ("a.txt", "sub/b.txt"):
+        assert (second / name).read_text() == (tree / name).read_text()
+        assert (first / name).stat().st_ino == (second / name).stat().st_ino == (tree / name).stat().st_ino
+
+
+def test_patching_linked_tree_leaves_store_intact(run_source, tmp_path, source_cache, archive_server):
+    root, url, _ = archive_server
+    sha256 = make_archive(root / "project.tar.gz", {"a.txt": "a\n"})
+    patch_file = tmp_path / "a.patch"
+    patch_file.write_text(PATCH)
+    get = f'source_cache.get(self, url="{url}/project.tar.gz", sha256="{sha256}", strip_root=True)'
+
+    patched = run_source("patched", f'{get}\npatch(self, patch_file="{patch_file.as_posix()}", strip=1)')
+    pristine = run_source("pristine", get)
+
+    assert (patched / "a.txt").read_text() == "patched\n"
+    assert (source_cache / "trees" / f"{sha256}-stripped" / "a.txt").read_text() == "a\n"
+    assert (pristine / "a.txt").read_text() == "a\n"
+
+
+def test_archive_store_ignores_digest_case(run_source, source_cache, archive_server):
+    root, url, requests = archive_server
+    sha256 = make_archive(root / "project.tar.gz", {"a.txt": "a\n"})
+
+    for name, digest in (("upper", sha256.upper()), ("lower", sha256)):
+        folder = run_source(name, f'source_cache.get(self, url="{url}/project.tar.gz", sha256="{digest}", strip_root=True)')
+        assert (folder / "a.txt").read_text() == "a\n"
+
+    assert requests == ["/project.tar.gz"]
+    assert [path.name for path in (source_cache / "archives").iterdir()] == [sha256]
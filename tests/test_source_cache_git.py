@@ -0,0 +1,94 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+
+def git(folder, *args):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@localhost", "-c", "protocol.file.allow=always", *args],
+                   cwd=folder, check=True, capture_output=True)
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    """Local repository with two commits, the second tagged v1.0 and adding a submodule in external/sub"""
+    submodule, repository = tmp_path / "upstream-sub", tmp_path / "upstream"
+    for folder in (submodule, repository):
+        folder.mkdir()
+        git(folder, "init", "-q")
+    (submodule / "sub.txt").write_text("sub\n")
+    git(submodule, "add", ".")
+    git(submodule, "commit", "-q", "-m", "sub")
+    (repository / "README").write_text("readme\n")
+    git(repository, "add", ".")
+    git(repository, "commit", "-q", "-m", "readme")
+    (repository / "main.txt").write_text("main\n")
+    git(repository, "submodule", "add", "-q", str(submodule), "external/sub")
+    git(repository, "add", ".")
+    git(repository, "commit", "-q", "-m", "main")
+    git(repository, "tag", "-a", "v1.0", "-m", "v1.0")
+    return repository
+
+
+def test_git_clone_served_from_mirror(run_source, source_cache, upstream):
+    body = f'source_cache.git_clone(self, url="{upstream.as_posix()}", tag="v1.0", target=os.path.join(self.source_folder, "src"), submodules=True)'
+
+    first = run_source("first", body)
+    # Later checkouts must not need the upstream repositories anymore
+    for folder in (upstream, upstream.with_name("upstream-sub")):
+        shutil.move(folder, folder.with_name(f"{folder.name}-gone"))
+    second = run_source("second", body)
+
+    for folder in (first, second):
+        assert (folder / "src" / "main.txt").read_text() == "main\n"
+        assert (folder / "src" / "external" / "sub" / "sub.txt").read_text() == "sub\n"
+        assert os.path.isfile(folder / "src" / ".git" / "objects" / "info" / "alternates")
+    assert len(list((source_cache / "git").iterdir())) == 2
+
+
+def test_mirror_checkout_describes_its_tag(run_source, source_cache, upstream):
+    body = f'source_cache.git_clone(self, url="{upstream.as_posix()}", tag="v1.0", target=os.path.join(self.source_folder, "src"))'
+
+    folder = run_source("describe", body) / "src"
+
+    # Version detection like slang's runs `git describe --tags` on the checkout
+    for args in (["describe", "--tags"], ["describe"]):
+        assert subprocess.run(["git", *args], cwd=folder, check=True, capture_output=True, text=True).stdout.strip() == "v1.0"
+    log = subprocess.run(["git", "log", "--format=%s"], cwd=folder, check=True, capture_output=True, text=True).stdout
+    assert log.split() == ["main"]
+
+
+def test_checkout_submodules_at_pinned_tags(run_source, source_cache, upstream):
+    submodule = upstream.with_name("upstream-sub")
+    (submodule / "sub.txt").write_text("sub v2\n")
+    git(submodule, "commit", "-q", "-am", "sub v2")
+    git(submodule, "tag", "v2")
+    body = f"""
+        target = os.path.join(self.source_folder, "src")
+        source_cache.git_clone(self, url="{upstream.as_posix()}", tag="v1.0", target=target)
+        source_cache.git_checkout_submodules(self, target, ["external/sub"], tags={{"external/sub": "v2"}})
+    """
+
+    folder = run_source("pinned", body)
+
+    assert (folder / "src" / "main.txt").read_text() == "main\n"
+    assert (folder / "src" / "external" / "sub" / "sub.txt").read_text() == "sub v2\n"
+
+
+def test_checkout_submodules_into_destination(run_source, source_cache, upstream):
+    body = f"""
+        target = os.path.join(self.source_folder, "src")
+        source_cache.git_clone(self, url="{upstream.as_posix()}", tag="v1.0", target=target)
+        source_cache.git_checkout_submodules(self, target, [], destination=os.path.join(self.source_folder, "without"))
+        source_cache.git_checkout_submodules(self, target, ["external/sub"], destination=os.path.join(self.source_folder, "with"))
+    """
+
+    folder = run_source("destination", body)
+
+    # The shared checkout stays as it was, each tree only gets the submodules asked for
+    assert not os.listdir(folder / "src" / "external" / "sub")
+    assert not os.listdir(folder / "without" / "external" / "sub")
+    assert (folder / "with" / "external" / "sub" / "sub.txt").read_text() == "sub\n"
+    assert (folder / "with" / "main.txt").stat().st_ino == (folder / "src" / "main.txt").stat().st_ino
+    assert not os.path.exists(folder / "with" / ".git")
@@ -0,0 +1,96 @@
+# Times what boost's dependency index costs a recipe instance: loading it, config_options and
+# _build_flags, for a few with_*/without_* selections. Conan instantiates the recipe many times
+# while expanding a graph, so every measurement uses a fresh instance.
+#
+# Point --recipe-folder at an older checkout of the recipe to get the numbers before a change:
+#
+#   python tools/benchmark_boost_index.py
+#   git worktree add /tmp/boost-before 33f2709^
+#   python tools/benchmark_boost_index.py --recipe-folder /tmp/boost-before/recipes/boost/all
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+import yaml
+
+from benchmark_recipes import ROOT, instantiate, load_recipe
+
+SELECTIONS = {
+    "default": {},
+    "with_log": {"with_log": True},
+    "without_thread": {"without_thread": True},
+}
+
+
+def clear_caches(recipe_class):
+    recipe_class.config_options.__globals__.get("_dependency_indexes", {}).clear()
+
+
+def measure(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def prepare_folders(recipe_folder, version, recipe_class, tmp):
+    """Recipe folders as in a source checkout (yaml only) and as exported (yaml and json index)"""
+    dependencies = os.path.join(recipe_folder, "dependencies", f"dependencies-{version}.yml")
+    folders = {}
+    for kind in ("yaml", "json"):
+        if kind == "json" and not hasattr(recipe_class, "_build_dependency_index"):
+            continue  # recipes from before the precompiled index
+        folder = os.path.join(tmp, kind)
+        os.makedirs(os.path.join(folder, "dependencies"))
+        shutil.copy2(dependencies, os.path.join(folder, "dependencies"))
+        if kind == "json":
+            with open(dependencies, encoding="utf-8") as f:
+                index = recipe_class._build_dependency_index(yaml.safe_load(f))
+            with open(os.path.join(folder, "dependencies", f"dependencies-{version}.json"), "w", encoding="utf-8") as f:
+                json.dump(index, f, default=sorted)
+        folders[kind] = folder
+    return folders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time boost's dependency index, config_options and _build_flags")
+    parser.add_argument("--recipe-folder", default=os.path.join(ROOT, "recipes", "boost", "all"))
+    parser.add_argument("--version", default="1.92.0")
+    parser.add_argument("--repeat", type=int, default=20, help="measurements per row, the median is reported")
+    args = parser.parse_args()
+
+    recipe_class = load_recipe(args.recipe_folder)
+    with tempfile.TemporaryDirectory() as tmp:
+        folders = prepare_folders(args.recipe_folder, args.version, recipe_class, tmp)
+
+        def new_instance(folder, selection=None):
+            conanfile = instantiate(recipe_class, folder, args.version, None)
+            for name, value in (selection or {}).items():
+                setattr(conanfile.options, name, value)
+            return conanfile
+
+        def cold_load(folder):
+            clear_caches(recipe_class)
+            return new_instance(folder)._dependencies
+
+        rows = {f"load dependencies (cold, {kind})": measure(lambda: cold_load(folder), args.repeat)
+                for kind, folder in folders.items()}
+        folder = folders.get("json", folders["yaml"])
+        rows["load dependencies (warm)"] = measure(lambda: new_instance(folder)._dependencies, args.repeat)
+        rows["config_options"] = measure(lambda: new_instance(folder).config_options(), args.repeat)
+        for name, selection in SELECTIONS.items():
+            rows[f"_build_flags {name}"] = measure(lambda: new_instance(folder, selection)._build_flags, args.repeat)
+
+    print(f"boost/{args.version} from {args.recipe_folder}")
+    for name, elapsed in rows.items():
+        print(f"  {name:36} {elapsed * 1e3:9.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
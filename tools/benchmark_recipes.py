@@ -0,0 +1,264 @@
+# Times the Python work every recipe does while Conan expands a graph.
+#
+# Each recipes/<name>/all/conanfile.py is loaded for every version of its config.yml and the
+# config_options, configure, requirements, package_id and generate methods are run against mocked
+# settings, options and generators, so no Conan cache, profile or network is needed.
+#
+#   python tools/benchmark_recipes.py --save results.json
+#   python tools/benchmark_recipes.py --recipe boost --compare results.json
+import argparse
+import copy
+import glob
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import time
+
+import yaml
+
+try:
+    from conan import ConanFile
+except ImportError:
+    sys.exit("benchmark_recipes.py needs Conan 2 importable by this Python, e.g. `pip install conan`")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METHODS = ("config_options", "configure", "requirements", "package_id", "generate")
+DEFAULT_SETTINGS = {
+    "os": "Linux",
+    "arch": "x86_64",
+    "compiler": "gcc",
+    "compiler.version": "14",
+    "compiler.cppstd": "20",
+    "compiler.libcxx": "libstdc++11",
+    "build_type": "Release",
+}
+
+
+class MockValue:
+    def __init__(self, value):
+        self._value = value
+
+    def __bool__(self):
+        return self._value not in (None, False, "False", "None")
+
+    def __str__(self):
+        return str(self._value)
+
+    def __eq__(self, other):
+        if isinstance(other, MockValue):
+            other = other._value
+        return str(self._value) == str(other)
+
+    def __hash__(self):
+        return hash(str(self._value))
+
+    def __int__(self):
+        return int(self._value)
+
+
+class MockValues:
+    def __init__(self, values):
+        object.__setattr__(self, "_values", dict(values))
+
+    def __getattr__(self, name):
+        try:
+            return MockValue(self._values[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        self._values[name] = value._value if isinstance(value, MockValue) else value
+
+    def __delattr__(self, name):
+        del self._values[name]
+
+    def __contains__(self, name):
+        return name in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def get_safe(self, name, default=None):
+        value = self._values.get(name, default)
+        return None if value is None else MockValue(value)
+
+    def rm_safe(self, name):
+        self._values.pop(name, None)
+
+    def items(self):
+        return self._values.items()
+
+    def clear(self):
+        self._values.clear()
+
+    def copy(self):
+        return MockValues(self._values)
+
+
+class MockConf:
+    def get(self, name, default=None, check_type=None):
+        return default
+
+
+class MockInfo:
+    def __init__(self, conanfile):
+        self.settings = conanfile.settings.copy()
+        self.options = conanfile.options.copy()
+
+    def clear(self):
+        self.settings.clear()
+        self.options.clear()
+
+
+class MockGenerator:
+    def __init__(self, conanfile, *args, **kwargs):
+        self.variables = {}
+        self.cache_variables = {}
+        self.preprocessor_definitions = {}
+
+    def generate(self):
+        pass
+
+
+def load_recipe(recipe_folder):
+    name = os.path.basename(os.path.dirname(recipe_folder))
+    spec = importlib.util.spec_from_file_location(f"benchmark_{name.replace('-', '_')}", os.path.join(recipe_folder, "conanfile.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for generator in ("CMakeToolchain", "CMakeConfigDeps", "CMakeDeps"):
+        if hasattr(module, generator):
+            setattr(module, generator, MockGenerator)
+    return next(value for value in vars(module).values()
+                if isinstance(value, type) and issubclass(value, ConanFile) and value is not ConanFile)
+
+
+def instantiate(recipe_class, recipe_folder, version, conan_data):
+    conanfile = recipe_class.__new__(recipe_class)
+    options = getattr(recipe_class, "options", None) or {}
+    default_options = getattr(recipe_class, "default_options", None) or {}
+    settings = getattr(recipe_class, "settings", None) or ()
+    if isinstance(settings, str):
+        settings = (settings,)
+    conanfile.__dict__.update({
+        "display_name": f"{recipe_class.name}/{version}",
+        "_conan_node": None,
+        "version": version,
+        "recipe_folder": recipe_folder,
+        "conan_data": conan_data,
+        "options": MockValues({name: default_options.get(name) for name in options}),
+        "settings": MockValues({key: value for key, value in DEFAULT_SETTINGS.items() if key.split(".")[0] in settings}),
+        "conf": MockConf(),
+        "requires": lambda *args, **kwargs: None,
+        "tool_requires": lambda *args, **kwargs: None,
+        "build_requires": lambda *args, **kwargs: None,
+        "test_requires": lambda *args, **kwargs: None,
+    })
+    conanfile.__dict__["settings_build"] = conanfile.settings
+    conanfile.__dict__["settings_target"] = None
+    return conanfile
+
+
+def run_methods(recipe_class, recipe_folder, version, conan_data):
+    timings = {}
+    conanfile = instantiate(recipe_class, recipe_folder, version, conan_data)
+    for method in METHODS:
+        func = getattr(conanfile, method, None)
+        if func is None:
+            continue
+        if method == "package_id":
+            conanfile.info = MockInfo(conanfile)
+        start = time.perf_counter()
+        func()
+        timings[method] = time.perf_counter() - start
+    return timings
+
+
+def benchmark(recipe_names, repeat):
+    results, failures = {}, []
+    for config_file in sorted(glob.glob(os.path.join(ROOT, "recipes", "*", "config.yml"))):
+        name = os.path.basename(os.path.dirname(config_file))
+        if recipe_names and name not in recipe_names:
+            continue
+        with open(config_file, encoding="utf-8") as f:
+            versions = yaml.safe_load(f)["versions"]
+        for version, version_info in versions.items():
+            recipe_folder = os.path.join(ROOT, "recipes", name, version_info["folder"])
+            conandata_file = os.path.join(recipe_folder, "conandata.yml")
+            samples = {}
+            try:
+                start = time.perf_counter()
+                recipe_class = load_recipe(recipe_folder)
+                load_time = time.perf_counter() - start
+                conan_data = None
+                if os.path.isfile(conandata_file):
+                    with open(conandata_file, encoding="utf-8") as f:
+                        conan_data = yaml.safe_load(f)
+                for _ in range(repeat):
+                    for method, elapsed in run_methods(recipe_class, recipe_folder, str(version), copy.deepcopy(conan_data)).items():
+                        samples.setdefault(method, []).append(elapsed)
+            except Exception as e:
+                # One broken recipe (or one needing a newer Python) must not hide the others
+                print(f"FAILED {name}/{version}: {type(e).__name__}: {e}", file=sys.stderr)
+                failures.append(f"{name}/{version}")
+                continue
+            # The first evaluation pays for lazily loaded data (e.g. boost's dependency index)
+            result = {"load": load_time, "cold": sum(values[0] for values in samples.values())}
+            result.update({method: statistics.median(values) for method, values in samples.items()})
+            result["total"] = sum(statistics.median(values) for values in samples.values())
+            results[f"{name}/{version}"] = result
+    return results, failures
+
+
+def print_results(results, baseline, threshold):
+    regressions = []
+    columns = ("load", "cold") + METHODS + ("total",)
+    width = 21 if baseline else 15
+    print(f"{'reference':42}" + "".join(f"{column:>{width}}" for column in columns))
+    for reference, result in results.items():
+        line = f"{reference:42}"
+        for column in columns:
+            value = result.get(column)
+            if value is None:
+                line += f"{'-':>{width}}"
+                continue
+            cell = f"{value * 1e3:.3f}ms"
+            previous = (baseline or {}).get(reference, {}).get(column)
+            if previous:
+                change = (value - previous) / previous
+                cell += f"{change:+.0%}"[:6].rjust(6)
+                if column not in ("load", "cold") and change > threshold:
+                    regressions.append((reference, column, previous, value))
+            line += f"{cell:>{width}}"
+        print(line)
+    for reference, column, previous, value in regressions:
+        print(f"REGRESSION {reference} {column}: {previous * 1e3:.3f}ms -> {value * 1e3:.3f}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time recipe evaluation for every recipe and version in the repo")
+    parser.add_argument("--recipe", action="append", default=[], help="only benchmark this recipe (repeatable)")
+    parser.add_argument("--repeat", type=int, default=20, help="evaluations per version, the median is reported")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    results, failures = benchmark(set(args.recipe), args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = print_results(results, baseline, args.threshold)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    for reference in failures:
+        print(f"FAILED {reference}")
+    sys.exit(1 if regressions or failures else 0)
+
+
+if __name__ == "__main__":
+    main()
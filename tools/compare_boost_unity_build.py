@@ -0,0 +1,72 @@
+# Compares the wall-clock time of building boost with and without the unity_build option.
+#
+# Every configuration is built from scratch with `conan create --build=boost/*` in a throwaway
+# CONAN_HOME. A header-only warm-up build fetches the sources first, so the numbers only cover
+# configure, build and package. Extra -o/-s arguments select the libraries and
+# the profile, compiled libraries are where unity builds matter. On a machine without access to the
+# boost archive, --source-cache points at a folder filled by tools/prefetch_sources.py.
+#
+#   python tools/compare_boost_unity_build.py -o boost/*:with_filesystem=True -o boost/*:with_json=True
+#   python tools/compare_boost_unity_build.py --batch-size 8 --batch-size 32 --repeat 3
+#   python tools/compare_boost_unity_build.py --source-cache ~/.conan2/source_cache -o boost/*:with_json=True
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def conan(env, *args):
+    subprocess.run(["conan", *args], env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time boost builds with and without unity_build")
+    parser.add_argument("--version", default="1.92.0", help="boost version to build")
+    parser.add_argument("--batch-size", type=int, action="append", default=[], help="unity_build_batch_size to time (repeatable, default 16)")
+    parser.add_argument("--repeat", type=int, default=1, help="builds per configuration, the median is reported")
+    parser.add_argument("-o", "--options", action="append", default=[], help="extra option passed to conan create")
+    parser.add_argument("-s", "--settings", action="append", default=[], help="extra setting passed to conan create")
+    parser.add_argument("--source-cache", help="user.source_cache:folder to take the boost sources from")
+    args = parser.parse_args()
+
+    configurations = [("regular", ["boost/*:unity_build=False"])]
+    configurations += [(f"unity, batch {size}", ["boost/*:unity_build=True", f"boost/*:unity_build_batch_size={size}"])
+                       for size in args.batch_size or [16]]
+
+    with tempfile.TemporaryDirectory() as conan_home:
+        env = dict(os.environ, CONAN_HOME=conan_home)
+        conan(env, "profile", "detect")
+        conan(env, "export", os.path.join(ROOT, "recipes", "source_cache", "all"), "--version", "1.0")
+        recipe = os.path.join(ROOT, "recipes", "boost", "all")
+        sources = ["-c", f"user.source_cache:folder={os.path.abspath(args.source_cache)}"] if args.source_cache else []
+        common = sources + [arg for option in args.options for arg in ("-o", option)]
+        common += [arg for setting in args.settings for arg in ("-s", setting)]
+        # Runs source() once, every timed build below reuses the source folder of the cache
+        conan(env, "create", recipe, "--version", args.version, "--build=boost/*", *sources,
+              "-o", "boost/*:header_only=True", "-o", "boost/*:with_config=True")
+
+        results = {}
+        for name, options in configurations:
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                conan(env, "create", recipe, "--version", args.version, "--build=boost/*", *common,
+                      *(arg for option in options for arg in ("-o", option)))
+                samples.append(time.perf_counter() - start)
+            results[name] = statistics.median(samples)
+            print(f"{name:20} {results[name]:8.1f}s", flush=True)
+
+    baseline = results["regular"]
+    for name, elapsed in results.items():
+        if name != "regular":
+            print(f"{name:20} {baseline / elapsed:.2f}x the speed of the regular build")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+# Fills a source_cache folder with every source the recipes need, so they build fully offline with
+# `user.source_cache:folder=<folder>`.
+#
+# Archives listed in the conandata.yml files are downloaded and verified against their sha256. Git
+# tags and commits are fetched into bare mirrors together with every submodule they pin, and with the
+# submodule refs a conandata.yml pins on top of those (`submodules: {path: tag}`). The work
+# runs on a bounded thread pool, partial downloads are resumed and finished entries are recorded in
+# <folder>/manifest.json, so a second run after an interruption only fetches what is missing.
+#
+#   python tools/prefetch_sources.py ~/.conan2/source_cache --jobs 16
+#   python tools/prefetch_sources.py /mnt/mirror --recipe boost --verify
+import argparse
+import collections
+import concurrent.futures
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import urllib.error
+import urllib.request
+
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GIT_URL_RE = re.compile(r'git_clone\(self, url="([^"]+)"')
+
+
+def load_source_cache():
+    # The cache layout is defined by the source_cache python_requires, not duplicated here
+    spec = importlib.util.spec_from_file_location("source_cache", os.path.join(ROOT, "recipes", "source_cache", "all", "conanfile.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def collect_sources(recipe_names):
+    for config_file in sorted(glob.glob(os.path.join(ROOT, "recipes", "*", "config.yml"))):
+        name = os.path.basename(os.path.dirname(config_file))
+        if recipe_names and name not in recipe_names:
+            continue
+        with open(config_file, encoding="utf-8") as f:
+            versions = yaml.safe_load(f)["versions"]
+        for version, version_info in versions.items():
+            recipe_folder = os.path.join(ROOT, "recipes", name, version_info["folder"])
+            conandata_file = os.path.join(recipe_folder, "conandata.yml")
+            if not os.path.isfile(conandata_file):
+                continue
+            with open(conandata_file, encoding="utf-8") as f:
+                source = (yaml.safe_load(f).get("sources") or {}).get(str(version))
+            if not source:
+                continue
+            reference = f"{name}/{version}"
+            if "sha256" in source:
+                yield {"kind": "archive", "reference": reference, "url": source["url"], "sha256": source["sha256"]}
+            elif "tag" in source or "commit" in source:
+                with open(os.path.join(recipe_folder, "conanfile.py"), encoding="utf-8") as f:
+                    match = GIT_URL_RE.search(f.read())
+                if match is None:
+                    print(f"WARNING {reference}: no git_clone() URL found in conanfile.py", file=sys.stderr)
+                    continue
+                yield {"kind": "git", "reference": reference, "url": match.group(1), "tag": source.get("tag"),
+                       "commit": source.get("commit"), "extra_refs": source.get("submodules", {})}
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def download_resumable(url, partial):
+    offset = os.path.getsize(partial) if os.path.isfile(partial) else 0
+    request = urllib.request.Request(url, headers={"Range": f"bytes={offset}-"} if offset else {})
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            # Servers ignoring the Range header send the whole file again
+            with open(partial, "ab" if response.status == 206 else "wb") as f:
+                shutil.copyfileobj(response, f, 1 << 20)
+    except urllib.error.HTTPError as e:
+        if e.code != 416:  # the partial file already holds everything
+            raise
+
+
+def git(folder, *args):
+    return subprocess.run(["git", *args], cwd=folder, check=True, capture_output=True, text=True).stdout.strip()
+
+
+class Prefetcher:
+    def __init__(self, folder, jobs, verify, source_cache):
+        self.folder = os.path.abspath(os.path.expanduser(folder))
+        self.verify = verify
+        self.source_cache = source_cache
+        self.manifest_file = os.path.join(self.folder, "manifest.json")
+        self.manifest = {"entries": {}}
+        if os.path.isfile(self.manifest_file):
+            with open(self.manifest_file, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self.lock = threading.Lock()
+        self.mirror_locks = collections.defaultdict(threading.Lock)
+        self.submitted = set()
+        self.futures = []
+        self.failures = []
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
+
+    def submit(self, key, func, *args):
+        with self.lock:
+            if key in self.submitted:
+                return
+            self.submitted.add(key)
+            self.futures.append(self.executor.submit(self._run, key, func, *args))
+
+    def _run(self, key, func, *args):
+        try:
+            status = func(key, *args)
+            print(f"{status:8} {key}")
+        except Exception as e:
+            with self.lock:
+                self.failures.append((key, e))
+            print(f"FAILED   {key}: {getattr(e, 'stderr', None) or e}".rstrip(), file=sys.stderr)
+
+    def record(self, key, entry):
+        with self.lock:
+            self.manifest["entries"][key] = entry
+            staging = f"{self.manifest_file}.{os.getpid()}"
+            with open(staging, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, indent=2, sort_keys=True)
+            os.replace(staging, self.manifest_file)
+
+    def run(self, sources):
+        for source in sources:
+            if source["kind"] == "archive":
+                self.submit(f"archive:{source['sha256'].lower()}", self.fetch_archive, source)
+            else:
+                self.submit(f"git:{source['url']}@{source['tag'] or source['commit']}", self.fetch_git,
+                            source["url"], source["tag"], source["commit"], source["extra_refs"])
+        # Finished git fetches queue their submodules, so wait until nothing is left
+        while True:
+            with self.lock:
+                pending = [future for future in self.futures if not future.done()]
+            if not pending:
+                break
+            concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        self.executor.shutdown()
+        return self.failures
+
+    def fetch_archive(self, key, source):
+        urls = source["url"] if isinstance(source["url"], list) else [source["url"]]
+        # Some conandata.yml files spell the digest in uppercase
+        sha256 = source["sha256"].lower()
+        archive = self.source_cache.archive_path(os.path.join(self.folder, "archives"), sha256,
+                                                 os.path.basename(urls[0].split("?")[0]))
+        entry = {"kind": "archive", "reference": source["reference"], "url": urls[0], "sha256": sha256,
+                 "path": os.path.relpath(archive, self.folder)}
+        if os.path.isfile(archive):
+            recorded = self.manifest["entries"].get(key, {})
+            if not self.verify and recorded.get("size") == os.path.getsize(archive):
+                return "cached"
+            if sha256_file(archive) == sha256:
+                self.record(key, dict(entry, size=os.path.getsize(archive)))
+                return "verified"
+            os.unlink(archive)
+        os.makedirs(os.path.dirname(archive), exist_ok=True)
+        partial = f"{archive}.part"
+        for url in urls:
+            try:
+                download_resumable(url, partial)
+            except OSError as e:
+                error = e
+                continue
+            if sha256_file(partial) == sha256:
+                os.replace(partial, archive)
+                self.record(key, dict(entry, url=url, size=os.path.getsize(archive)))
+                return "fetched"
+            error = ValueError(f"sha256 mismatch for {url}")
+            os.unlink(partial)
+        raise error
+
+    def fetch_git(self, key, url, tag, commit, extra_refs=None):
+        mirror = self.source_cache.mirror_path(os.path.join(self.folder, "git"), url)
+        ref, refspec = self.source_cache.mirror_refspec(tag, commit)
+        status = "cached"
+        with self.mirror_locks[mirror]:
+            if not os.path.isdir(mirror):
+                os.makedirs(os.path.dirname(mirror), exist_ok=True)
+                git(os.path.dirname(mirror), "init", "-q", "--bare", mirror)
+                git(mirror, "remote", "add", "origin", url)
+            try:
+                git(mirror, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+            except subprocess.CalledProcessError:
+                git(mirror, "fetch", "-q", "--depth", "1", "origin", refspec)
+                status = "fetched"
+            revision = git(mirror, "rev-parse", f"{ref}^{{commit}}")
+        self.record(key, {"kind": "git", "url": url, "ref": tag or commit, "revision": revision,
+                          "path": os.path.relpath(mirror, self.folder)})
+
+        submodules = {}
+        try:
+            paths = git(mirror, "config", "--blob", f"{revision}:.gitmodules", "--get-regexp", r"^submodule\..*\.path$")
+        except subprocess.CalledProcessError:
+            paths = ""
+        for line in paths.splitlines():
+            name, path = line.split(maxsplit=1)
+            name = name[len("submodule."):-len(".path")]
+            sub_url = self.source_cache.resolve_url(url, git(mirror, "config", "--blob", f"{revision}:.gitmodules", "--get", f"submodule.{name}.url"))
+            sub_commit = git(mirror, "ls-tree", revision, "--", path).split()[2]
+            submodules[path] = sub_url
+            self.submit(f"git:{sub_url}@{sub_commit}", self.fetch_git, sub_url, None, sub_commit)
+        for path, extra_ref in (extra_refs or {}).items():
+            if path not in submodules:
+                raise ValueError(f"{url}@{tag or commit} has no submodule {path}")
+            self.submit(f"git:{submodules[path]}@{extra_ref}", self.fetch_git, submodules[path], extra_ref, None)
+        return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch every recipe source into a source_cache folder for offline builds")
+    parser.add_argument("folder", help="source cache folder, later passed as user.source_cache:folder")
+    parser.add_argument("--recipe", action="append", default=[], help="only prefetch this recipe (repeatable)")
+    parser.add_argument("--jobs", type=int, default=8, help="concurrent downloads and fetches")
+    parser.add_argument("--verify", action="store_true", help="re-hash archives already recorded in the manifest")
+    args = parser.parse_args()
+
+    prefetcher = Prefetcher(args.folder, args.jobs, args.verify, load_source_cache())
+    failures = prefetcher.run(collect_sources(set(args.recipe)))
+    print(f"{len(prefetcher.manifest['entries'])} entries in {prefetcher.manifest_file}, {len(failures)} failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
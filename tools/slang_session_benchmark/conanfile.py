@@ -0,0 +1,31 @@
+# Times slang::createGlobalSession() against a slang package, to compare the startup latency of the
+# core module options. Every `conan build` compiles the harness against the requested slang
+# configuration and runs it:
+#
+#   conan build tools/slang_session_benchmark --build=missing
+#   conan build tools/slang_session_benchmark --build=missing -o "slang/*:embed_core_module=False"
+#   conan build tools/slang_session_benchmark --build=missing -o "slang/*:embed_core_module_source=False"
+import os
+
+from conan import ConanFile
+from conan.tools.cmake import CMake, cmake_layout
+
+
+class SlangSessionBenchmarkRecipe(ConanFile):
+    settings = "os", "arch", "compiler", "build_type"
+    generators = "CMakeToolchain", "CMakeConfigDeps", "VirtualRunEnv"
+
+    def requirements(self):
+        self.requires("slang/[>=2026.12]")
+
+    def layout(self):
+        cmake_layout(self)
+
+    def build(self):
+        cmake = CMake(self)
+        cmake.configure()
+        cmake.build()
+        options = self.dependencies["slang"].options
+        self.output.info(f"embed_core_module={options.embed_core_module} "
+                         f"embed_core_module_source={options.embed_core_module_source}")
+        self.run(os.path.join(self.cpp.build.bindir, "slang_session_benchmark"), env="conanrun")
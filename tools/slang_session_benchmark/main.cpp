@@ -0,0 +1,26 @@
+#include <slang.h>
+#include <slang-com-ptr.h>
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+
+// Creates a few global sessions one after the other. The first one also pays for loading the
+// library, the later ones show what every new session costs.
+int main(int argc, char** argv)
+{
+    const int iterations = argc > 1 ? std::atoi(argv[1]) : 5;
+    for (int i = 0; i < iterations; ++i)
+    {
+        const auto start = std::chrono::steady_clock::now();
+        Slang::ComPtr<slang::IGlobalSession> session;
+        if (SLANG_FAILED(slang::createGlobalSession(session.writeRef())))
+        {
+            std::fprintf(stderr, "slang::createGlobalSession failed\n");
+            return EXIT_FAILURE;
+        }
+        const std::chrono::duration<double, std::milli> elapsed = std::chrono::steady_clock::now() - start;
+        std::printf("createGlobalSession #%d: %.2f ms\n", i + 1, elapsed.count());
+    }
+    return EXIT_SUCCESS;
+}
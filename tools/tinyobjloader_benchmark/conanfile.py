@@ -0,0 +1,38 @@
+# Parses generated OBJ meshes with the classic tinyobj::LoadObj() and the multithreaded
+# tinyobj_opt::parseObj() of a tinyobjloader package, and reports MB/s and triangles/s. Every
+# `conan build` compiles the harness against the requested configuration and runs it:
+#
+#   conan build tools/tinyobjloader_benchmark --build=missing
+#   conan build tools/tinyobjloader_benchmark --build=missing -o "tinyobjloader/*:double=True"
+#
+# The grid sides of the generated meshes can be changed with `-c user.tinyobjloader_benchmark:sizes="512 2048"`.
+import os
+
+from conan import ConanFile
+from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
+
+
+class TinyobjloaderBenchmarkRecipe(ConanFile):
+    settings = "os", "arch", "compiler", "build_type"
+    generators = "CMakeConfigDeps", "VirtualRunEnv"
+    default_options = {"tinyobjloader/*:with_opt_loader": True}
+
+    def requirements(self):
+        self.requires("tinyobjloader/2.0.0rc13")
+
+    def layout(self):
+        cmake_layout(self)
+
+    def generate(self):
+        tc = CMakeToolchain(self)
+        tc.variables["TINYOBJLOADER_USE_DOUBLE"] = self.dependencies["tinyobjloader"].options.double
+        tc.generate()
+
+    def build(self):
+        cmake = CMake(self)
+        cmake.configure()
+        cmake.build()
+        options = self.dependencies["tinyobjloader"].options
+        self.output.info(f"double={options.double} opt_loader_threads={options.opt_loader_threads}")
+        sizes = self.conf.get("user.tinyobjloader_benchmark:sizes", default="256 1024", check_type=str)
+        self.run(f'{os.path.join(self.cpp.build.bindir, "tinyobjloader_benchmark")} {sizes}', env="conanrun")
@@ -0,0 +1,100 @@
+#include <tiny_obj_loader.h>
+
+#include <algorithm>
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <functional>
+#include <sstream>
+#include <string>
+#include <vector>
+
+long long parseOptimized(const std::string& obj);
+
+namespace {
+
+// A side x side grid of quads split in two triangles, with positions, texture coordinates and normals
+std::string generateMesh(int side)
+{
+    std::string obj;
+    char line[128];
+    const int points = side + 1;
+    for (int y = 0; y < points; ++y)
+        for (int x = 0; x < points; ++x)
+        {
+            const float u = float(x) / side, v = float(y) / side;
+            std::snprintf(line, sizeof(line), "v %.6f %.6f %.6f\nvt %.6f %.6f\nvn 0 0 1\n", u, v, 0.05f * ((x ^ y) & 7), u, v);
+            obj += line;
+        }
+    for (int y = 0; y < side; ++y)
+        for (int x = 0; x < side; ++x)
+        {
+            const int a = y * points + x + 1, b = a + 1, c = a + points, d = c + 1;
+            std::snprintf(line, sizeof(line), "f %d/%d/%d %d/%d/%d %d/%d/%d\nf %d/%d/%d %d/%d/%d %d/%d/%d\n",
+                          a, a, a, b, b, b, d, d, d, a, a, a, d, d, d, c, c, c);
+            obj += line;
+        }
+    return obj;
+}
+
+long long parseClassic(const std::string& obj)
+{
+    tinyobj::attrib_t attrib;
+    std::vector<tinyobj::shape_t> shapes;
+    std::vector<tinyobj::material_t> materials;
+    std::string warn, err;
+    std::istringstream stream(obj);
+    if (!tinyobj::LoadObj(&attrib, &shapes, &materials, &warn, &err, &stream))
+    {
+        std::fprintf(stderr, "%s\n", err.c_str());
+        return -1;
+    }
+    long long faces = 0;
+    for (const tinyobj::shape_t& shape : shapes)
+        faces += static_cast<long long>(shape.mesh.num_face_vertices.size());
+    return faces;
+}
+
+// Best of a few runs, so the first one paying for page faults does not count
+bool report(const char* loader, const std::function<long long(const std::string&)>& parse, const std::string& obj,
+            long long triangles)
+{
+    double best = 0.0;
+    for (int run = 0; run < 3; ++run)
+    {
+        const auto start = std::chrono::steady_clock::now();
+        const long long faces = parse(obj);
+        const std::chrono::duration<double> elapsed = std::chrono::steady_clock::now() - start;
+        if (faces != triangles)
+        {
+            std::fprintf(stderr, "%s parsed %lld triangles, expected %lld\n", loader, faces, triangles);
+            return false;
+        }
+        best = run == 0 ? elapsed.count() : std::min(best, elapsed.count());
+    }
+    std::printf("  %-9s %8.1f ms %9.1f MB/s %9.2f Mtris/s\n", loader, best * 1e3, obj.size() / best / 1e6,
+                triangles / best / 1e6);
+    return true;
+}
+
+} // namespace
+
+// Grid sides of the meshes to parse as arguments, 256 and 1024 by default
+int main(int argc, char** argv)
+{
+    std::vector<int> sides;
+    for (int i = 1; i < argc; ++i)
+        sides.push_back(std::atoi(argv[i]));
+    if (sides.empty())
+        sides = {256, 1024};
+    std::printf("tinyobj::real_t is %s\n", sizeof(tinyobj::real_t) == sizeof(double) ? "double" : "float");
+    for (int side : sides)
+    {
+        const std::string obj = generateMesh(side);
+        const long long triangles = 2LL * side * side;
+        std::printf("%dx%d grid: %.1f MB, %lld triangles\n", side, side, obj.size() / 1e6, triangles);
+        if (!report("classic", parseClassic, obj, triangles) || !report("optimized", parseOptimized, obj, triangles))
+            return EXIT_FAILURE;
+    }
+    return EXIT_SUCCESS;
+}
@@ -0,0 +1,20 @@
+// The optimized loader is header-only, its implementation is compiled here on its own so it does not
+// meet the declarations of tiny_obj_loader.h
+#define TINYOBJ_LOADER_OPT_IMPLEMENTATION
+#include <tinyobj_loader_opt.h>
+
+#include <cstddef>
+#include <string>
+#include <vector>
+
+// Number of faces parsed from obj, -1 on failure
+long long parseOptimized(const std::string& obj)
+{
+    tinyobj_opt::attrib_t attrib;
+    std::vector<tinyobj_opt::shape_t> shapes;
+    std::vector<tinyobj_opt::material_t> materials;
+    tinyobj_opt::LoadOption option;
+    if (!tinyobj_opt::parseObj(&attrib, &shapes, &materials, obj.data(), obj.size(), option))
+        return -1;
+    return static_cast<long long>(attrib.face_num_verts.size());
+}